@@ -65,6 +65,13 @@ print(df.head())
 export_path = os.path.join(data_processed, excel_file)
 df.to_excel(export_path)
 
+# Streaming: read the sheet in chunks of rows from a read-only workbook and write them with a write-only workbook
+# Only one chunk is held in memory at a time, so sheets close to the 1,048,576 row limit stay cheap to convert
+from streaming_excel import iter_excel, write_excel_streaming
+
+chunks = iter_excel(import_path, index_col='Review #', chunksize=1000)
+print(write_excel_streaming(chunks, export_path))
+
 
 # --- From and To JSON ---
 # Read JSON file into a DataFrame and display first 5 rows
@@ -91,6 +98,30 @@ export_path = os.path.join(data_processed, html_file)
 df_list[0].to_html(export_path, index=False)
 
 
+# --- Parallel and Incremental JSON and HTML Reading ---
+# Large records JSON, JSON lines and HTML table files can be split into byte ranges at record
+# boundaries and parsed by several worker processes; iter_json() and iter_html() read them in
+# chunks with bounded memory instead
+# Process pools re-import this script on Windows and macOS, so they are only started from the main script
+from parallel_readers import read_json_parallel, read_html_parallel, iter_json, iter_html
+
+# Write the ramen ratings as JSON lines (one record per line), which can be split at any newline
+jsonl_path = os.path.join(data_processed, "ramen-ratings.jsonl")
+df.to_json(jsonl_path, orient='records', lines=True)
+
+if __name__ == '__main__':
+    # Parse the JSON lines file and the HTML table in worker processes
+    print(read_json_parallel(jsonl_path).equals(pd.read_json(jsonl_path, orient='records', lines=True, dtype=False)))
+    print(read_html_parallel(import_path).equals(df_list[0]))
+
+# Read the files chunk by chunk, only one chunk is held in memory at a time
+for chunk in iter_json(jsonl_path, chunk_bytes=100_000):
+    print(chunk.shape)
+
+for chunk in iter_html(import_path, chunksize=1000):
+    print(chunk.shape)
+
+
 # --- From and To SQL ---
 # Import create_engine from SQLAlchemy and set up connection to SQLite database
 from sqlalchemy import create_engine
@@ -103,6 +134,17 @@ print(df.head())
 # Export DataFrame to SQL table, replacing it if it already exists
 df.to_sql(sql_table, engine, if_exists='replace')
 
+# Bulk path for large tables: batched inserts in one transaction on a pooled engine that is reused across calls
+from sql_bulk import bulk_write, read_sql_chunks
+bulk_write(df, sql_table, database, if_exists='replace')
+
+# Upsert keyed on 'Review #': existing reviews are updated, new reviews are inserted
+bulk_write(df.head(), sql_table, database, if_exists='upsert', key='Review #')
+
+# Read the table back in chunks instead of loading it all at once
+for chunk in read_sql_chunks(sql_table, database, chunksize=1000, index_col='Review #'):
+    print(chunk.shape)
+
 
 # --- From and To Parquet, Feather and HDF ---
 
@@ -128,6 +170,16 @@ print(df.head())
 export_path = os.path.join(data_processed, feather_file)
 df.to_feather(export_path)
 
+# Zero-copy loading: an uncompressed Feather file can be memory-mapped, so columns are Arrow-backed views of the file
+# Worker processes that map the same file share one copy in the page cache instead of holding private copies
+from zero_copy import write_feather_uncompressed, read_feather_mmap
+
+export_path = os.path.join(data_processed, "ramen-ratings-uncompressed.feather")
+write_feather_uncompressed(df, export_path)
+mmap_df = read_feather_mmap(export_path)
+
+print(mmap_df.dtypes)
+
 # From and To HDF
 # Read from HDF5 file using a specific key and display first 5 rows
 import_path = os.path.join(data_raw, hdf_file)
@@ -139,9 +191,40 @@ print(df.head())
 export_path = os.path.join(data_processed, hdf_file)
 df.to_hdf(export_path, key='df', mode='w', format='table', complib='blosc', complevel=9)
 
+# Query-on-read: store 'Country', 'Brand', 'Style' and a numeric 'Stars' as indexed data columns
+# A where= condition is answered from the column indexes, so only the chunks holding matching rows are decompressed
+from hdf_query import write_query_table, read_where
+
+export_path = os.path.join(data_processed, "ramen-ratings-indexed.h5")
+write_query_table(df, export_path, complib='blosc', complevel=9)
+
+print(read_where(export_path, where="Country == 'Japan' and Stars >= 4.5").head(3))
+print(read_where(export_path, where="Country in ['Japan', 'South Korea']", columns=['Brand', 'Variety', 'Style']).head(3))
+
+# Incremental refresh: append only reviews with a 'Review #' above the high-water mark kept in a small manifest
+# Parquet gets one new part file per refresh, HDF5 appends to its table, so a re-run writes nothing
+from incremental_writer import append_new_rows
+
+export_path = os.path.join(data_processed, "ramen-ratings-incremental.parquet")
+print(append_new_rows(df, export_path, key='Review #'))
+
+export_path = os.path.join(data_processed, "ramen-ratings-incremental.h5")
+print(append_new_rows(df, export_path, key='Review #', complib='blosc', complevel=9))
+
+
+# --- Exporting All Formats in Parallel ---
+# Write the last DataFrame to every format at once: threads for I/O-bound writers, processes for Excel, JSON and HTML
+# Every file is written to a temporary name and renamed, and the time per writer is reported
+from parallel_export import export_all
+
+if __name__ == '__main__':
+    timings_df = export_all(df, os.path.join(data_processed, "parallel"), base_name="ramen-ratings")
+    print(timings_df)
+
 
 # --- Comparing File Sizes ---
 # Measure and print file size (in KB) of each saved file, sorted from smallest to largest
+# For read/write times and peak memory per format and compression run format_benchmark.py
 from pathlib import Path
 
 folder = Path(data_processed)
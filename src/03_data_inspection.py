@@ -2,19 +2,14 @@
 # Demonstrates data inspection techniques using the Ramen Ratings dataset
 
 # --- Import Libraries ---
-# Import pandas for data handling and os for path operations
-import pandas as pd
-import os
+# Import the shared loader that caches parsed datasets and the memory report helper
+from dataset_loader import load_dataset
+from compact_dtypes import memory_report
 
 
 # --- Load Dataset ---
-# Set path variables for raw data and define the CSV filename
-data_raw = "../data/raw/"
-csv_file = "ramen-ratings.csv"
-
-# Build the full import path and load the CSV into a DataFrame using 'Review #' as the index column
-import_path = os.path.join(data_raw, csv_file)
-df = pd.read_csv(import_path, index_col='Review #')
+# Load the Ramen Ratings CSV through the cached loader using 'Review #' as the index column
+df = load_dataset('ramen', index_col='Review #')
 
 
 # --- Basic Dataset Overview ---
@@ -43,6 +38,16 @@ print(df.info())
 print(df.memory_usage())
 
 
+# --- Compact Loading ---
+# Load the dataset again in compact mode: low-cardinality strings become categoricals, numbers are downcast
+# and 'Stars' is parsed into a nullable float at read time ('Unrated' becomes <NA>)
+compact_df = load_dataset('ramen', compact=True, index_col='Review #')
+print(compact_df.dtypes)
+
+# Compare the deep memory usage per column before and after compacting
+print(memory_report(df, compact_df))
+
+
 # --- Missing & Null Values ---
 # Show the number of missing (NaN) values per column
 print(df.isnull().sum())
@@ -3,17 +3,18 @@
 
 
 # --- Import Libraries ---
-# Import pandas for data handling and os for path operations
-import pandas as pd
-import os
+# Import the shared loader that caches parsed datasets, the pushdown selection and the persistent lookup index
+from dataset_loader import datasets, load_dataset, source_digest
+from pushdown_selection import write_partitioned_dataset, dataset_is_current, select
+from lookup_index import build_index, index_is_current, LookupIndex
 
 
 # --- Load Dataset ---
-# Define path and load the CSV file into a DataFrame
-data_raw = "../data/raw/"
-csv_file = "ramen-ratings.csv"
-import_path = os.path.join(data_raw, csv_file)
-df = pd.read_csv(import_path)
+# Load the Ramen Ratings CSV into a DataFrame through the cached loader
+df = load_dataset('ramen')
+
+# Content hash of the source CSV, files derived from it below are rebuilt when it changes
+ramen_digest = source_digest(datasets['ramen'])
 
 
 # --- Set & Reset Index ---
@@ -48,6 +49,25 @@ print(df.iloc[[0, 1], [0, 1, 2]])
 print(df.loc[[2580, 2579], ['Brand', 'Variety', 'Style']])
 
 
+# --- Repeated Lookups with a Persistent Index ---
+# Build the index next to the processed dataset: a sorted 'Review #' array plus inverted indexes for Brand, Country and Style
+# It is only rebuilt when the source CSV changed since the last run
+index_path = "../data/processed/ramen-ratings.index"
+if not index_is_current(index_path, ramen_digest):
+    build_index(df, index_path, key='Review #', inverted=['Brand', 'Country', 'Style'], source_digest=ramen_digest)
+
+# Load the memory-mapped index and make sure it matches the DataFrame
+review_index = LookupIndex(index_path)
+review_index.check(df, source_digest=ramen_digest)
+
+# Same lookups as above with a binary search instead of a scan of the index
+print(review_index.at(df, 2580, 'Variety'))
+print(review_index.loc(df, [2580, 2579], ['Brand', 'Variety', 'Style']))
+
+# Equality filter through the inverted index for 'Brand' (first 3 rows)
+print(review_index.filter(df, Brand='Yamachan').head(3))
+
+
 # --- Slice the DataFrame ---
 # Slice rows by position: rows 10 to 12 (stop exclusive)
 print(df[10:13])
@@ -105,6 +125,24 @@ print(query_df.query("Country == 'Japan' and Stars >= 4.5").head(3))
 print(query_df.query("Country in ['Japan', 'Taiwan']").head(3))
 
 
+# --- Select with Predicate & Column Pushdown ---
+# Store the reviews as a Parquet dataset partitioned by 'Country', with numeric 'Stars' so row groups keep min/max statistics
+# It is only rewritten when the source CSV changed since the last run
+dataset_path = "../data/processed/ramen-ratings-by-country"
+if not dataset_is_current(dataset_path, ramen_digest):
+    write_partitioned_dataset(query_df, dataset_path, partition_by=['Country'], sort_by=['Brand'],
+                              source_digest=ramen_digest)
+
+# The same query as above, but only the 'Country=Japan' partition is opened and only matching rows are materialized
+print(select(dataset_path, query="Country == 'Japan' and Stars >= 4.5").head(3))
+
+# Filters in read_parquet style together with a column list: only 'Brand' and 'Stars' are read from disk
+print(select(dataset_path, columns=['Brand', 'Stars'], filters=[('Brand', '==', 'Yamachan'), ('Stars', '>', 4.5)]))
+
+# Partition pruning with a list of countries
+print(select(dataset_path, columns=['Brand', 'Variety', 'Style'], query="Country in ['Japan', 'South Korea']").head(3))
+
+
 # --- Select with Regex ---
 # Select columns with names matching regex 'C' (first 5 rows)
 print(df.filter(regex='C').head())
@@ -3,20 +3,23 @@
 
 
 # --- Import Libraries ---
-# Import pandas and numpy for data handling and os for path operations
+# Import pandas and numpy for data handling, the shared loader that caches parsed datasets, the chunked cleaner and the median imputer
 import pandas as pd
 import numpy as np
-import os
+from dataset_loader import load_dataset, dataset_path
+from chunked_cleaning import clean_csv_in_chunks
+from median_imputation import GroupMedianImputer
 
 
-# --- Load Dataset ---
-# Define path and load the CSV file into a DataFrame
-data_raw = "../data/raw/"
-csv_file = "titanic.csv"
-import_path = os.path.join(data_raw, csv_file)
+# --- Copy-on-Write ---
+# Enable copy-on-write: copies share their data with the original until one of them is modified,
+# so the df.copy(deep=False) branches below cost no memory until they change a column
+pd.options.mode.copy_on_write = True
+
 
-# Load dataset with PassengerId as index
-df = pd.read_csv(import_path, index_col="PassengerId")
+# --- Load Dataset ---
+# Load the Titanic CSV through the cached loader with PassengerId as index
+df = load_dataset('titanic', index_col="PassengerId")
 
 
 # --- Inspecting Missing Data ---
@@ -61,14 +64,14 @@ print(pd.notna(first_passenger))
 
 # --- Handling Missing Data on Import ---
 # Load CSV disabling default NA value recognition (keep all strings as-is)
-a_df = pd.read_csv(import_path, index_col="PassengerId", keep_default_na=False)
+a_df = load_dataset('titanic', index_col="PassengerId", keep_default_na=False)
 print(a_df.info())
 
 # Define additional strings to treat as NaN
 na_vals = ["C", "Missing"]
 
 # Load CSV treating 'C' and 'Missing' as NaN
-b_df = pd.read_csv(import_path, index_col="PassengerId", na_values=na_vals)
+b_df = load_dataset('titanic', index_col="PassengerId", na_values=na_vals)
 print(b_df.info())
 
 # Check unique values in 'Embarked' column
@@ -83,7 +86,7 @@ print(b_df['Embarked'].unique())
 
 # --- Cleaning Data Types ---
 # Create a copy for cleaning
-c_df = df.copy()
+c_df = df.copy(deep=False)
 
 # Show data types of all columns
 print(c_df.dtypes)
@@ -109,57 +112,57 @@ print(c_df.dtypes)
 
 # --- Dropping Missing or Unwanted Data ---
 # Copy dataset and drop row with index label 1
-drop_a_df = df.copy()
+drop_a_df = df.copy(deep=False)
 print(drop_a_df.drop(index=1).head(3))
 
 # Drop all rows with any missing value
-drop_b_df = df.copy()
+drop_b_df = df.copy(deep=False)
 print(drop_b_df.dropna(axis=0).head(3))
 
 # Drop all columns with any missing value
-drop_c_df = df.copy()
+drop_c_df = df.copy(deep=False)
 print(drop_c_df.dropna(axis=1).head(3))
 
 # Drop rows where both Age and Cabin are missing (all missing)
-drop_d_df = df.copy()
+drop_d_df = df.copy(deep=False)
 print(drop_d_df.dropna(axis='index', how='all', subset=['Age', 'Cabin']).head(3))
 
 # Drop rows where any of Age or Cabin is missing
-drop_e_df = df.copy()
+drop_e_df = df.copy(deep=False)
 print(drop_e_df.dropna(axis='index', how='any', subset=['Age', 'Cabin']).head(3))
 
 # Drop 'Age' and 'Cabin' columns from dataset
-drop_f_df = df.copy()
+drop_f_df = df.copy(deep=False)
 drop_f_df.drop(columns=['Age', 'Cabin'], inplace=True)
 print(drop_f_df.head(3))
 
 # Duplicate dataset by concatenation, then drop duplicates
-drop_g_df = df.copy()
+drop_g_df = df.copy(deep=False)
 drop_g_df = pd.concat([drop_g_df, drop_g_df])
 print(len(drop_g_df))  # Expect 1782
 drop_g_df.drop_duplicates(inplace=True)
 print(len(drop_g_df))  # Back to 891
 
 # Drop all rows where 'Survived' equals 0 (filtering for survivors)
-survived_df = df.copy()
+survived_df = df.copy(deep=False)
 dead_filter = survived_df['Survived'] == 0
 print(survived_df.drop(index=survived_df[dead_filter].index).head(3))
 
 
 # --- Filling Missing Data ---
 # Fill all missing values with 0
-fill_a_df = df.copy()
+fill_a_df = df.copy(deep=False)
 print(fill_a_df.fillna(0).head(3))
 
 # Fill missing values in 'Age' column with 0, inplace
-fill_b_df = df.copy()
+fill_b_df = df.copy(deep=False)
 fill_b_df.fillna({'Age': 0}, inplace=True)
 print(fill_b_df.head(6))
 
 
 # --- Detecting and Cleaning Invalid Categorical Values ---
 # Copy dataset and show unique values in 'Sex' column
-san_a_df = df.copy()
+san_a_df = df.copy(deep=False)
 print(san_a_df['Sex'].unique())
 
 # Standardize 'Sex' values by stripping whitespace, lowering, then title casing
@@ -167,7 +170,7 @@ san_a_df['Sex'] = san_a_df['Sex'].str.strip().str.lower().str.title()
 print(san_a_df['Sex'].unique())
 
 # Create copy and replace 'male' with blank space in 'Sex' column
-san_b_df = df.copy()
+san_b_df = df.copy(deep=False)
 san_b_df['Sex'] = san_b_df['Sex'].replace({'male': ' '})
 print(san_b_df.head(3))
 
@@ -184,28 +187,35 @@ print(df['Age'].mean())
 print(df['Age'].median())
 
 # Filter rows where Age is missing and show first 3
-without_age_df = df.copy()
+without_age_df = df.copy(deep=False)
 without_age_filter = without_age_df['Age'].isna()
 print(without_age_df[without_age_filter].head(3))
 
 # Fill missing Age values with median Age
-clean_median_age_df = df.copy()
+clean_median_age_df = df.copy(deep=False)
 clean_median_age_df.fillna({'Age': clean_median_age_df['Age'].median()}, inplace=True)
 print(clean_median_age_df.isna().sum())
 
 # Fill missing Age values with mean Age
-clean_mean_age_df = df.copy()
+clean_mean_age_df = df.copy(deep=False)
 clean_mean_age_df.fillna({'Age': clean_mean_age_df['Age'].mean()}, inplace=True)
 print(clean_mean_age_df.isna().sum())
 
 # Fill missing Age values grouped by Survived, Pclass, and Sex using group median
-clean_related_age_df = df.copy()
+clean_related_age_df = df.copy(deep=False)
 relation_filter = ['Survived', 'Pclass', 'Sex']
 clean_related_age_df['Age'] = clean_related_age_df.groupby(relation_filter)['Age'].transform(lambda x: x.fillna(x.median()))
 print(clean_related_age_df.isna().sum())
 
+# Same grouped median fill in two streaming passes: collect per-group medians first, then fill chunk by chunk
+# Works on files larger than RAM and avoids calling a Python lambda per group
+age_imputer = GroupMedianImputer(relation_filter, 'Age').fit_csv(dataset_path('titanic'), chunksize=200)
+print(age_imputer.group_medians())
+streamed_age_df = age_imputer.transform(df.copy(deep=False))
+print(streamed_age_df['Age'].equals(clean_related_age_df['Age']))  # Expect True
+
 # Drop all rows where Age is missing
-clean_droped_df = df.copy()
+clean_droped_df = df.copy(deep=False)
 clean_droped_df = clean_droped_df.dropna(subset=['Age'])
 print(clean_droped_df.isna().sum())
 
@@ -220,7 +230,7 @@ print(f"Clean droped data set median age: >> {clean_droped_df['Age'].median()} <
 
 # --- Cleaning the Cabin Column ---
 # Filter rows where Cabin is missing and show first 3
-clean_cabin_df = df.copy()
+clean_cabin_df = df.copy(deep=False)
 without_cabin_filter = clean_cabin_df['Cabin'].isna()
 print(clean_cabin_df[without_cabin_filter].head(3))
 
@@ -231,7 +241,7 @@ print(clean_cabin_df.head(3))
 
 # --- Cleaning the Embarked Column ---
 # Filter rows where Embarked is missing
-without_embarked_df = df.copy()
+without_embarked_df = df.copy(deep=False)
 without_embarked_filter = without_embarked_df['Embarked'].isna()
 print(without_embarked_df[without_embarked_filter])
 
@@ -252,7 +262,7 @@ print(without_embarked_df[stone_filter])
 print(without_embarked_df[evelyn_filter])
 
 # Fill missing Embarked values with 'S' (most common port)
-clean_embarked_df = df.copy()
+clean_embarked_df = df.copy(deep=False)
 clean_embarked_df['Embarked'] = clean_embarked_df['Embarked'].fillna('S')
 print(clean_embarked_df['Embarked'].isna().sum())
 
@@ -262,6 +272,14 @@ print(clean_embarked_df.info())
 print(clean_embarked_df.head(3))
 
 
+# --- Streaming Cleaning for Large Files ---
+# Apply the Sex, Cabin and Embarked cleaning and deduplication chunk by chunk, appending each chunk to the output file
+# Memory stays bounded by the chunk size, so the same steps work for files much larger than RAM
+export_path = "../data/processed/stream_clean_titanic.csv"
+rows_read, rows_written = clean_csv_in_chunks(dataset_path('titanic'), export_path, chunksize=200, dtype={'Age': 'float64'})
+print(f"Streamed {rows_read} rows, wrote {rows_written} cleaned rows to {export_path}")
+
+
 # --- Footer ---
 """
 🐼 Pandas Handbook by Pymetheus
@@ -3,21 +3,24 @@
 
 
 # --- Import Libraries ---
-# Import pandas and numpy for data handling and os for path operations
+# Import pandas and numpy for data handling, the shared loader that caches parsed datasets and the name parser
 import pandas as pd
 import numpy as np
-import os
+from dataset_loader import load_dataset
+from name_parser import parse_names
+
+# --- Copy-on-Write ---
+# Enable copy-on-write: copies share their data with the original until one of them is modified,
+# so the df.copy(deep=False) branches below cost no memory until they change a column
+pd.options.mode.copy_on_write = True
 
 # --- Load Dataset ---
-# Set the path to the cleaned Titanic CSV file and load it into a DataFrame with PassengerId as index
-data_processed = "../data/processed/"
-csv_file = "clean_titanic.csv"
-import_path = os.path.join(data_processed, csv_file)
-df = pd.read_csv(import_path, index_col="PassengerId")
+# Load the cleaned Titanic CSV through the cached loader with PassengerId as index
+df = load_dataset('clean_titanic', index_col="PassengerId")
 
 # --- Filter dataset for passengers with 'Mrs.' in their name ---
 # Create a copy of the DataFrame and filter rows where 'Name' contains 'Mrs.'
-mrs_df = df.copy()
+mrs_df = df.copy(deep=False)
 mrs_filter = mrs_df['Name'].str.contains('Mrs.')
 mrs_df = mrs_df[mrs_filter]
 
@@ -40,7 +43,7 @@ print(mrs_df.head(3))
 
 # --- Splitting & Extracting Values ---
 # Create a copy of the original DataFrame and extract maiden names enclosed in parentheses into a new column
-maiden_df = df.copy()
+maiden_df = df.copy(deep=False)
 maiden_df['Maiden Name'] = maiden_df['Name'].str.extract(r'\(([^)]+)\)')
 print(maiden_df[['Name', 'Maiden Name']].head(3))
 
@@ -62,6 +65,12 @@ mrs_df['Rest'] = mrs_df['Rest'].str.replace(')', '')
 mrs_df['Husband'] = mrs_df['Husband'].replace(r'^\s*$', 'Unknown', regex=True)
 print(mrs_df.head())
 
+# The same split in a single pass: one compiled regex on Arrow strings instead of the split chain above
+# 'Rest' holds the maiden name at this point, it is renamed to 'Maiden Name' further below
+name_parts = parse_names(mrs_df['Name'])
+chain_parts = mrs_df[['Surname', 'Title', 'Husband', 'Rest']].rename(columns={'Rest': 'Maiden Name'})
+print(name_parts.astype(object).where(name_parts.notna(), None).equals(chain_parts))  # Expect True
+
 # --- Merging Columns ---
 # Create a new column 'Husband Fullname' by concatenating 'Surname' and 'Husband' with a comma separator
 mrs_df['Husband Fullname'] = mrs_df['Surname'] + ',' + mrs_df['Husband']
@@ -3,17 +3,15 @@
 
 
 # --- Import Libraries ---
-# Import pandas for data handling and os for path operations
+# Import pandas for data handling, the shared loader that caches parsed datasets and the out-of-core joins
 import pandas as pd
-import os
+from dataset_loader import load_dataset
+from out_of_core_join import merge_out_of_core, join_out_of_core
 
 
 # --- Load Dataset ---
-# Define the file path and load the CSV into a DataFrame with PassengerId as index
-data_processed = "../data/processed/"
-csv_file = "clean_titanic.csv"
-import_path = os.path.join(data_processed, csv_file)
-df = pd.read_csv(import_path, index_col="PassengerId")
+# Load the cleaned Titanic CSV through the cached loader with PassengerId as index
+df = load_dataset('clean_titanic', index_col="PassengerId")
 
 
 # --- Concatenation ---
@@ -71,6 +69,26 @@ joined_df = df.join(titles, on='PassengerId')
 print(joined_df.head(3))
 
 
+# --- Out-of-Core Merging and Joining ---
+# For inputs larger than memory: both sides are hash-partitioned on the key into Parquet files on disk,
+# each pair of partitions is merged on its own and the result is streamed to a Parquet file
+# Inputs can also be Parquet or CSV file paths, which are read in chunks
+merged_path = "../data/processed/titanic-merged.parquet"
+
+# Left merge of the Overpaid flags, the result has the same rows as merged_df in partition order
+rows = merge_out_of_core(df, extra_info, merged_path, on='PassengerId', how='left', partitions=8)
+print(rows)
+print(pd.read_parquet(merged_path).sort_index().equals(merged_df))
+
+# All four join types work the same way
+rows = merge_out_of_core(left_df, right_df, merged_path, on='PassengerId', how='outer', partitions=8)
+print(pd.read_parquet(merged_path).sort_index())
+
+# Index join of the titles, like df.join(titles, on='PassengerId')
+rows = join_out_of_core(df, titles, merged_path, on='PassengerId', partitions=8)
+print(pd.read_parquet(merged_path).sort_index().equals(joined_df))
+
+
 # --- Footer ---
 """
 🐼 Pandas Handbook by Pymetheus
@@ -3,17 +3,15 @@
 
 
 # --- Import Libraries ---
-# Import pandas for data handling and os for path operations
+# Import pandas for data handling, the shared loader that caches parsed datasets and the grouped predicate counter
 import pandas as pd
-import os
+from dataset_loader import load_dataset
+from grouped_predicates import GroupedPredicate
 
 
 # --- Load Dataset ---
-# Define file path and load the Titanic dataset with PassengerId as index
-data_processed = "../data/processed/"
-csv_file = "clean_titanic.csv"
-import_path = os.path.join(data_processed, csv_file)
-df = pd.read_csv(import_path, index_col="PassengerId")
+# Load the cleaned Titanic CSV through the cached loader with PassengerId as index
+df = load_dataset('clean_titanic', index_col="PassengerId")
 
 print(df.head(3))
 
@@ -104,8 +102,13 @@ print(new_group['Age'].agg(['median', 'mean']).loc[0])
 # Count how many entries in each group have 'Mrs.' in their 'Name'
 print(new_group['Name'].apply(lambda x: x.str.contains('Mrs.').sum()))
 
+# Same count without a Python call per group: build the 'Mrs.' mask once over the whole column and sum it per group
+# The mask and the result are cached, so the repeated counts below are free
+name_predicate = GroupedPredicate(df, ['Survived', 'Pclass'])
+print(name_predicate.sum('Name', 'Mrs.'))
+
 # Count 'Mrs.' occurrences for Survived=0 group
-print(new_group['Name'].apply(lambda x: x.str.contains('Mrs.').sum()).loc[0])
+print(name_predicate.sum('Name', 'Mrs.').loc[0])
 
 # Count unique values in 'Survived' column
 print(df['Survived'].value_counts())
@@ -114,11 +117,11 @@ print(df['Survived'].value_counts())
 print(df['Survived'].count())
 
 # Repeat count of 'Mrs.' occurrences (same as before, for clarity)
-print(new_group['Name'].apply(lambda x: x.str.contains('Mrs.').sum()))
+print(name_predicate.sum('Name', 'Mrs.'))
 
 # Combine total passengers and Mrs. counts into a new DataFrame
 total_passengers = new_group['Name'].count()
-mrs_count = new_group['Name'].apply(lambda x: x.str.contains('Mrs.').sum())
+mrs_count = name_predicate.sum('Name', 'Mrs.')
 new_df = pd.concat([total_passengers, mrs_count], axis=1)
 new_df.columns = ['Total', 'Mrs_Count']
 
@@ -146,6 +149,20 @@ pivot = pd.pivot_table(df, index='Sex', columns='Pclass', values=['Survived', 'A
 print(pivot)
 
 
+# --- Parallel Aggregation ---
+# The same aggregations split across worker processes: whole groups are assigned to workers and the
+# columns are shared through shared memory, so the results equal the single-threaded ones exactly
+from parallel_groupby import parallel_agg, parallel_pivot_table
+
+if __name__ == '__main__':
+    parallel_agg_df = parallel_agg(df, 'Pclass', {'Age': ['mean', 'median'], 'Fare': ['mean', 'max', 'min']})
+    print(parallel_agg_df.equals(agg_df))
+
+    parallel_pivot = parallel_pivot_table(df, index='Sex', columns='Pclass', values=['Survived', 'Age'],
+                                          aggfunc=['mean', 'median'])
+    print(parallel_pivot.equals(pivot))
+
+
 # --- Footer ---
 """
 🐼 Pandas Handbook by Pymetheus
@@ -3,18 +3,23 @@
 
 
 # --- Import Libraries ---
-# Import pandas for data handling and os for path operations
+# Import pandas for data handling and the shared loader that caches parsed datasets
 import pandas as pd
-import os
+from dataset_loader import load_dataset
+from date_parser import parse_iso_dates
+from time_partitions import write_time_partitions, TimePartitionStore
+from streaming_timeseries import SeriesStream
 
 
-# --- Load Dataset ---
-# Define the file path and load the weather dataset CSV into a DataFrame.
-data_raw = "../data/raw/"
-csv_file = "weather.csv"
-import_path = os.path.join(data_raw, csv_file)
+# --- Copy-on-Write ---
+# Enable copy-on-write: copies share their data with the original until one of them is modified,
+# so the df.copy(deep=False) branches below cost no memory until they change a column
+pd.options.mode.copy_on_write = True
+
 
-df = pd.read_csv(import_path)
+# --- Load Dataset ---
+# Load the weather dataset CSV into a DataFrame through the cached loader.
+df = load_dataset('weather')
 
 # Show first 3 rows to inspect the data
 print(df.head(3))
@@ -27,7 +32,7 @@ print(df.dtypes)
 
 # --- Datetime Conversion ---
 # Load the CSV again with 'date' parsed as datetime (using parse_dates).
-df = pd.read_csv(import_path, parse_dates=['date'], date_format='%Y-%m-%d')
+df = load_dataset('weather', parse_dates=['date'], date_format='%Y-%m-%d')
 
 # Show data types to confirm 'date' column is datetime
 print(df.dtypes)
@@ -35,8 +40,8 @@ print(df.dtypes)
 # Verify the type of the first date value
 print(type(df.loc[0, 'date']))
 
-# Alternatively, convert 'date' column to datetime after loading
-df = pd.read_csv(import_path)
+# Alternatively, convert 'date' column to datetime after loading (the raw load is served from the cache)
+df = load_dataset('weather')
 df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d')
 
 # Show data types again to confirm conversion
@@ -45,6 +50,13 @@ print(df.dtypes)
 # Verify type again after conversion
 print(type(df.loc[0, 'date']))
 
+# Or parse the fixed-width ISO dates with the integer kernel of date_parser, once per distinct date
+df = load_dataset('weather')
+df['date'] = parse_iso_dates(df['date'])
+
+# Show data types to confirm the same datetime64[ns] column
+print(df.dtypes)
+
 
 # --- Creating Date Ranges ---
 # Create a daily date range of 30 days starting from 1/1/2012 and put it in a DataFrame
@@ -166,7 +178,7 @@ for day in week:
 
 # --- Timezones and Localization ---
 # Create a copy of the DataFrame and localize 'date' to UTC timezone
-timezone_df = df.copy()
+timezone_df = df.copy(deep=False)
 timezone_df['date_utc'] = timezone_df['date'].dt.tz_localize('UTC')
 
 print(timezone_df['date_utc'].head())
@@ -183,38 +195,44 @@ time_filter = (df['date'] > pd.to_datetime('2013'))
 print(df.loc[time_filter].head(3))
 
 # Set 'date' as index and sort to enable slicing by date range
-filter_df = df.copy()
-filter_df.set_index('date', inplace=True)
-filter_df.sort_index(inplace=True)
+# The date-indexed, sorted frame is built once here and shared by all following sections
+date_df = df.set_index('date').sort_index()
+filter_df = date_df
 
 # Filter rows between 2013-01-02 and 2013-01-07
 period_filter = (filter_df.index >= pd.Timestamp('2013-01-02')) & (filter_df.index < pd.Timestamp('2013-01-07'))
 print(filter_df.loc[period_filter].head(3))
 
 # Slice all rows for year 2013
-slice_df = df.copy()
-slice_df.set_index('date', inplace=True)
-slice_df.sort_index(inplace=True)
+slice_df = date_df
 
 print(slice_df.loc['2013'].head(3))
 
 # Slice rows between two specific dates
 print(slice_df.loc['2013-01-02':'2013-01-09'])
 
+# Store the data in year/month partitions with a min/max date index per partition,
+# date ranges then open only the partitions they overlap instead of scanning every row
+write_time_partitions(date_df, "../data/processed/weather-partitioned")
+store = TimePartitionStore("../data/processed/weather-partitioned")
+
+print(store.overlapping(pd.Timestamp('2013-01-02'), pd.Timestamp('2013-01-07')))
+
+# Same selections as above, read from the partitioned store
+print(store.select(pd.Timestamp('2013-01-02'), pd.Timestamp('2013-01-07'), inclusive='left').head(3))
+print(store.loc('2013').head(3))
+print(store.select('2013-01-02', '2013-01-09'))
+
 
 # --- Frequency Conversion, Resampling and Rolling ---
-# Set 'date' as index for resampling operations
-weekly_df = df.copy()
-weekly_df.set_index('date', inplace=True)
-weekly_df.sort_index(inplace=True)
+# Use the date-indexed frame for resampling operations
+weekly_df = date_df
 
 # Change frequency to weekly without aggregation
 print(weekly_df.asfreq('W').head(3))
 
 # Resample monthly end ('ME') and calculate mean of temp_max
-resample_df = df.copy()
-resample_df.set_index('date', inplace=True)
-resample_df.sort_index(inplace=True)
+resample_df = date_df
 
 monthly_temp = resample_df.resample('ME')['temp_max'].mean()
 print(monthly_temp.head(3))
@@ -224,9 +242,7 @@ monthly_temp = resample_df.resample('YE')['temp_min'].mean()
 print(monthly_temp.head(3))
 
 # Calculate rolling mean with a window size of 3 for temp_max
-rolling_df = df.copy()
-rolling_df.set_index('date', inplace=True)
-rolling_df.sort_index(inplace=True)
+rolling_df = date_df.copy(deep=False)
 
 rolling_df['temp_max'] = rolling_df['temp_max'].rolling(window=3).mean()
 print(rolling_df['temp_max'].head())
@@ -234,7 +250,7 @@ print(rolling_df['temp_max'].head())
 
 # --- Handling Missing Data with .interpolate() ---
 # Check how many missing values are present in 'temp_max' after rolling mean
-interpolate_df = rolling_df.copy()
+interpolate_df = rolling_df.copy(deep=False)
 print(interpolate_df['temp_max'].isna().sum())
 
 # Interpolate missing values in 'temp_max' column
@@ -244,30 +260,44 @@ print(interpolate_df.head())
 
 # --- Calculating Lagged Values and Differences ---
 # Shift temp_max values by 1 period to get previous day's value
-shift_df = df.copy()
-shift_df.set_index('date', inplace=True)
-shift_df.sort_index(inplace=True)
+shift_df = date_df.copy(deep=False)
 
 shift_df['temp_max_prev_day'] = shift_df['temp_max'].shift(1)
 print(shift_df[['temp_max', 'temp_max_prev_day']].head(3))
 
 # Calculate difference between current and previous temp_max
-diff_df = df.copy()
-diff_df.set_index('date', inplace=True)
-diff_df.sort_index(inplace=True)
+diff_df = date_df.copy(deep=False)
 
 diff_df['temp_max_diff'] = diff_df['temp_max'].diff()
 print(diff_df[['temp_max', 'temp_max_diff']].head(3))
 
 # Calculate percentage change of temp_max from previous value
-pctchange_df = df.copy()
-pctchange_df.set_index('date', inplace=True)
-pctchange_df.sort_index(inplace=True)
+pctchange_df = date_df.copy(deep=False)
 
 pctchange_df['temp_max_diff_pct'] = pctchange_df['temp_max'].pct_change()
 print(pctchange_df[['temp_max', 'temp_max_diff_pct']].head(3))
 
 
+# --- Streaming Updates ---
+# Feed the rows one at a time in date order, as a sensor feed would deliver them;
+# the stream keeps only the last 3 values and the running sums of the open month and year
+stream = SeriesStream('temp_max', window=3)
+updates = []
+closed_months = []
+for timestamp, row in zip(date_df.index, date_df[['temp_max']].to_dict('records')):
+    update = stream.update(timestamp, row)
+    closed_months += update['closed_periods']['ME']
+    updates.append(update)
+closed_months += stream.flush()['ME']
+
+streamed_df = pd.DataFrame(updates, index=date_df.index).drop(columns='closed_periods')
+print(streamed_df.head(3))
+
+# The streamed values match the full-history results computed above up to float rounding
+print((streamed_df['rolling_mean'] - rolling_df['temp_max']).abs().max())
+print((pd.Series(dict(closed_months)) - resample_df.resample('ME')['temp_max'].mean()).abs().max())
+
+
 # --- Footer ---
 """
 🐼 Pandas Handbook by Pymetheus
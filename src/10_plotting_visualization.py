@@ -3,18 +3,15 @@
 
 
 # --- Import Libraries ---
-# Import pandas for data handling, matplotlib for visualization and os for path operations
-import pandas as pd
+# Import matplotlib for visualization, os for path operations and the shared dataset loader
 import matplotlib.pyplot as plt
 import os
+from dataset_loader import load_dataset
 
 
 # --- Load Dataset ---
-# Load the weather dataset, parse dates and set the 'date' column as the index.
-data_raw = "../data/raw/"
-csv_file = "weather.csv"
-import_path = os.path.join(data_raw, csv_file)
-df = pd.read_csv(import_path, parse_dates=['date'], date_format='%Y-%m-%d')
+# Load the weather dataset through the cached loader, parse dates and set the 'date' column as the index.
+df = load_dataset('weather', parse_dates=['date'], date_format='%Y-%m-%d')
 df.set_index('date', inplace=True)
 
 # Show first 3 rows of the dataframe
@@ -170,6 +167,38 @@ print(f"Plot saved to {export_path}")
 plt.close()
 
 
+# --- Downsampled Plotting ---
+# Long series have far more points than the figure has pixel columns, so drawing every point costs time without showing more
+# plot_downsampled keeps the smallest and largest value per pixel column, so peaks stay visible; it takes DataFrame.plot() options
+from downsampled_plot import plot_downsampled, plot_scatter, plot_hexbin
+
+print("Plotting all weather conditions with subplots, downsampled to the figure width...")
+ax = plot_downsampled(df, subplots=True, title='Weather conditions')
+plt.show()
+
+# The x limits are applied before reducing, so zooming in keeps the full detail of the visible range
+print("Plotting max temperature, downsampled within the axis limits...")
+ax = plot_downsampled(df['temp_max'], title='Max Temperature', xlim=('2012-01', '2012-03'), ylim=(0, 25), rot=45)
+plt.show()
+
+# Scatter and hexbin plots of large frames are pre-binned into grid cells, small frames are drawn as they are
+print("Plotting scatter and hexbin plots of temperature distribution (pre-binned above 100,000 rows)...")
+ax = plot_scatter(df, x='temp_min', y='temp_max', title='Temperature Distribution')
+plt.show()
+
+ax = plot_hexbin(df, x='temp_min', y='temp_max', title='Temperature Distribution')
+plt.show()
+
+
+# --- Batch Rendering ---
+# Render every chart of this chapter headlessly (Agg backend) in a process pool as PNG and SVG files
+# Charts whose data and options did not change since the last run are skipped
+from batch_charts import render_charts
+
+if __name__ == '__main__':
+    print(render_charts(df, os.path.join(data_processed, "charts")))
+
+
 # --- Footer ---
 """
 🐼 Pandas Handbook by Pymetheus
@@ -0,0 +1,158 @@
+# --- Pandas Handbook: Batch Chart Rendering ---
+# Renders the charts of 10_plotting_visualization.py headlessly in a process pool and skips charts whose data is unchanged
+
+
+# --- Import Libraries ---
+# Import pandas for data handling, matplotlib for drawing, hashlib/json for the render manifest
+# and concurrent.futures for the worker processes
+import pandas as pd
+import matplotlib.pyplot as plt
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from downsampled_plot import plot_downsampled
+
+
+# --- Chart Specs ---
+# Chart name: rows (start, end) to select, columns, optional transform, DataFrame.plot() options
+# and an optional second series drawn on the same axes ('overlay'), one entry per figure of 10_plotting_visualization.py
+january = ('2012-01-01', '2012-01-31')
+max_temp_style = dict(figsize=(12, 6), style='--o', color='red', linewidth=2, alpha=0.8,
+                      xlim=('2012-01', '2012-03'), ylim=(0, 25), rot=45)
+
+chart_specs = {
+    'weather-conditions': {'plot': dict(subplots=True, title='Weather conditions')},
+    'january-weather': {'rows': january, 'plot': dict(kind='line', title='Weather conditions in January')},
+    'january-temperature': {'rows': january, 'columns': ['temp_max', 'temp_min'],
+                            'plot': dict(kind='line', title='Max. vs min. temperature')},
+    'temperature-scatter': {'rows': january, 'plot': dict(kind='scatter', x='temp_min', y='temp_max',
+                                                          title='Temperature Distribution')},
+    'temperature-hexbin': {'rows': january, 'plot': dict(kind='hexbin', x='temp_min', y='temp_max',
+                                                         title='Temperature Distribution')},
+    'wind-precipitation-stacked': {'rows': january, 'columns': ['wind', 'precipitation'],
+                                   'plot': dict(stacked=True, title='Wind & Precipitation Distribution')},
+    'wind-line': {'rows': january, 'columns': 'wind', 'plot': dict(kind='line', title='Wind over Time')},
+    'wind-area': {'rows': january, 'columns': 'wind', 'plot': dict(kind='area', title='Wind over Time')},
+    'wind-bar': {'rows': january, 'columns': 'wind', 'plot': dict(kind='bar', title='Wind over Time')},
+    'wind-hist': {'rows': january, 'columns': 'wind', 'plot': dict(kind='hist', bins=10, title='Wind over Time')},
+    'wind-box': {'rows': january, 'columns': 'wind', 'plot': dict(kind='box', title='Wind Box Plot')},
+    'wind-pie': {'rows': january, 'columns': 'wind', 'transform': 'value_counts',
+                 'plot': dict(kind='pie', title='Wind Strength Distribution')},
+    'temperature-change': {'rows': january, 'columns': ['temp_max', 'temp_min'],
+                           'plot': dict(kind='line', title='Change in Temperature over Time', xlabel='Time',
+                                        ylabel='Temperature', color=['red', 'blue'], figsize=(12, 6), grid=True,
+                                        legend=True, alpha=0.4)},
+    'max-temperature': {'columns': 'temp_max', 'plot': dict(title='Max Temperature', **max_temp_style)},
+    'max-temperature-wind': {'columns': 'temp_max',
+                             'plot': dict(title='Max Temperature with Wind Speed Overlay', **max_temp_style),
+                             'overlay': {'columns': 'wind',
+                                         'plot': dict(secondary_y=True, style='-s', color='steelblue', linewidth=1.5,
+                                                      alpha=0.6, xlim=('2012-01', '2012-03'), ylim=(0, 10), rot=45,
+                                                      label='Wind Speed')}},
+}
+
+
+def chart_data(df, spec):
+    """Select the rows and columns a chart spec draws."""
+    data = df if 'rows' not in spec else df.loc[spec['rows'][0]:spec['rows'][1]]
+    data = data if 'columns' not in spec else data[spec['columns']]
+    if spec.get('transform') == 'value_counts':
+        data = data.value_counts()
+    return data
+
+
+def chart_hash(spec, data, formats):
+    """Hash of the chart's data, options and output formats, a chart is re-rendered only when it changes."""
+    digest = hashlib.sha256(repr((spec, formats)).encode())
+    for frame in data if isinstance(data, tuple) else (data,):
+        digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+        digest.update(repr(list(frame.columns) if isinstance(frame, pd.DataFrame) else frame.name).encode())
+    return digest.hexdigest()
+
+
+# --- Rendering ---
+def draw(data, plot_kwargs):
+    # Line charts are reduced to the pixel width of the figure, other kinds need every row
+    if plot_kwargs.get('kind', 'line') == 'line':
+        return plot_downsampled(data, **plot_kwargs)
+    return data.plot(**plot_kwargs)
+
+
+def render_chart(name, spec, data, out_dir, formats):
+    """Draw one chart and save it in every format, runs in a worker process on the headless Agg backend."""
+    plt.switch_backend('Agg')
+    start = time.perf_counter()
+    main, overlay = data if isinstance(data, tuple) else (data, None)
+    ax = draw(main, spec['plot'])
+    if overlay is not None:
+        draw(overlay, {'ax': ax, **spec['overlay']['plot']})
+    figure = plt.gcf()
+    for file_format in formats:
+        path = Path(out_dir) / f"{name}.{file_format}"
+        tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp.{file_format}")
+        figure.savefig(tmp_path, format=file_format)
+        os.replace(tmp_path, path)
+    plt.close('all')
+    return time.perf_counter() - start
+
+
+def render_charts(df, out_dir="../data/processed/charts", specs=None, formats=('png', 'svg'), max_workers=None,
+                  force=False):
+    """Render every chart spec to out_dir in a process pool and return what happened to each chart.
+
+    The data hash of every rendered chart is kept in out_dir/manifest.json, charts whose data,
+    options and formats did not change since the last run are skipped unless force=True.
+    Call this from under if __name__ == '__main__', process pools re-import the calling script.
+    """
+    specs = chart_specs if specs is None else specs
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_file = out_dir / "manifest.json"
+    manifest = json.loads(manifest_file.read_text()) if manifest_file.exists() else {}
+
+    jobs = {}
+    rows = {}
+    for name, spec in specs.items():
+        data = chart_data(df, spec)
+        if 'overlay' in spec:
+            data = (data, chart_data(df, {**spec, **spec['overlay']}))
+        digest = chart_hash(spec, data, formats)
+        outputs_exist = all((out_dir / f"{name}.{file_format}").exists() for file_format in formats)
+        if not force and manifest.get(name) == digest and outputs_exist:
+            rows[name] = {'status': 'unchanged', 'seconds': 0.0}
+        else:
+            jobs[name] = (digest, data)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {name: pool.submit(render_chart, name, specs[name], data, out_dir, formats)
+                   for name, (digest, data) in jobs.items()}
+        for name, future in futures.items():
+            rows[name] = {'status': 'rendered', 'seconds': future.result()}
+            manifest[name] = jobs[name][0]
+    wall_s = time.perf_counter() - start
+
+    manifest_file.write_text(json.dumps(manifest, indent=2))
+    report = pd.DataFrame.from_dict(rows, orient='index').loc[list(specs)]
+    report.loc['wall clock'] = ['', wall_s]
+    return report.round(3)
+
+
+# --- Command Line ---
+if __name__ == '__main__':
+    from dataset_loader import load_dataset
+
+    parser = argparse.ArgumentParser(description="Render the charts of 10_plotting_visualization.py headlessly")
+    parser.add_argument('--output', default="../data/processed/charts")
+    parser.add_argument('--formats', nargs='+', default=['png', 'svg'])
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--force', action='store_true', help="render every chart even if its data is unchanged")
+    args = parser.parse_args()
+
+    weather_df = load_dataset('weather', parse_dates=['date'], date_format='%Y-%m-%d').set_index('date')
+    print(render_charts(weather_df, args.output, formats=tuple(args.formats), max_workers=args.workers,
+                        force=args.force).to_string())
@@ -0,0 +1,144 @@
+# --- Pandas Handbook: Chunked Data Cleaning ---
+# Applies the cleaning steps of 05_data_cleaning.py chunk by chunk so memory is bounded by the chunk size
+
+
+# --- Import Libraries ---
+# Import pandas and numpy for data handling and pyarrow for incremental Parquet output
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+
+
+# --- Cleaning Steps ---
+# Every step takes one chunk and returns the cleaned chunk, so steps never need the whole file
+def normalize_sex(chunk):
+    """Standardize 'Sex' values by stripping whitespace, lowering, then title casing."""
+    chunk['Sex'] = chunk['Sex'].str.strip().str.lower().str.title()
+    return chunk
+
+
+def fill_cabin(chunk):
+    """Replace missing Cabin values with 'Unknown'."""
+    chunk['Cabin'] = chunk['Cabin'].fillna('Unknown')
+    return chunk
+
+
+def fill_embarked(chunk):
+    """Fill missing Embarked values with 'S' (most common port)."""
+    chunk['Embarked'] = chunk['Embarked'].fillna('S')
+    return chunk
+
+
+default_steps = [normalize_sex, fill_cabin, fill_embarked]
+
+
+# --- Deduplication Across Chunks ---
+class DuplicateFilter:
+    """Drop rows already seen in this or an earlier chunk.
+
+    Like drop_duplicates() in 05_data_cleaning.py the index is ignored and all columns are
+    compared, but through a 64-bit hash per row instead of the values. The hashes of the distinct
+    rows seen so far are kept in one sorted uint64 array: 8 bytes per distinct row whatever the
+    row width, 8 MB for a million distinct rows, so this state grows with the number of distinct
+    rows while the rows themselves are only held one chunk at a time. Two different rows with the
+    same hash would be treated as duplicates and the later one dropped; with 64-bit hashes the
+    chance is about n**2 / 2**65 for n distinct rows (below 1e-7 for a million rows).
+
+    Chunks infer their column types on their own, so the hash must not depend on them: numeric
+    columns are hashed as float64 (a 22 read as int64 and a 22.0 read as float64 are the same
+    value for drop_duplicates()) and missing values get one hash whatever the column type.
+    """
+
+    def __init__(self):
+        self.seen = np.empty(0, dtype=np.uint64)
+
+    @staticmethod
+    def row_hashes(chunk):
+        """One uint64 hash per row that only depends on the values, not on the column types of the chunk."""
+        column_hashes = {}
+        for position, (name, column) in enumerate(chunk.items()):
+            if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+                # Adding 0.0 turns -0.0 into 0.0, which drop_duplicates() treats as equal
+                column = column.astype('float64') + 0.0
+            hashes = pd.util.hash_pandas_object(column, index=False).to_numpy()
+            column_hashes[position] = np.where(column.isna().to_numpy(), np.uint64(0), hashes)
+        return pd.util.hash_pandas_object(pd.DataFrame(column_hashes), index=False).to_numpy()
+
+    def __call__(self, chunk):
+        hashes = self.row_hashes(chunk)
+        first_in_chunk = ~pd.Series(hashes).duplicated().to_numpy()
+        positions = np.searchsorted(self.seen, hashes)
+        seen_before = positions < len(self.seen)
+        seen_before[seen_before] = self.seen[positions[seen_before]] == hashes[seen_before]
+        new_rows = first_in_chunk & ~seen_before
+
+        # Merge the new hashes into the sorted array without re-sorting the hashes already in it
+        new_hashes = np.sort(hashes[new_rows])
+        self.seen = np.insert(self.seen, np.searchsorted(self.seen, new_hashes), new_hashes)
+        return chunk[new_rows]
+
+
+# --- Incremental Writers ---
+class ChunkWriter:
+    """Append chunks to a CSV or Parquet file, chosen by the file suffix."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.parquet_writer = None
+        self.schema = None
+        self.first_chunk = True
+
+    def write(self, chunk):
+        if self.path.suffix == '.parquet':
+            if self.parquet_writer is None:
+                self.schema = pa.Schema.from_pandas(chunk)
+                self.parquet_writer = pq.ParquetWriter(self.path, self.schema, compression='snappy')
+            # Cast to the first chunk's schema, a chunk with only missing values would otherwise get a null type
+            table = pa.Table.from_pandas(chunk, schema=self.schema)
+            self.parquet_writer.write_table(table)
+        else:
+            chunk.to_csv(self.path, mode='w' if self.first_chunk else 'a', header=self.first_chunk)
+        self.first_chunk = False
+
+    def close(self):
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+
+
+# --- Streaming Pipeline ---
+def clean_csv_in_chunks(import_path, export_path, chunksize=100_000, steps=None, na_values=None,
+                        drop_duplicates=True, index_col="PassengerId", dtype=None):
+    """Read a CSV in chunks, clean every chunk and append it to export_path (.csv or .parquet).
+
+    na_values is passed to read_csv like in the 'Handling Missing Data on Import' section, and
+    dtype can pin column types so every chunk produces the same schema. Columns that the first
+    chunk reads as text are read as text in every chunk, so a later chunk of only numeric tickets
+    does not turn into int64. Returns the number of rows read and written.
+    """
+    dtype = dict(dtype or {})
+    first_chunk = pd.read_csv(import_path, index_col=index_col, nrows=chunksize, na_values=na_values, dtype=dtype)
+    dtype.update({name: str for name, column in first_chunk.items()
+                  if pd.api.types.is_object_dtype(column) and name not in dtype})
+
+    steps = default_steps if steps is None else steps
+    duplicate_filter = DuplicateFilter() if drop_duplicates else None
+    Path(export_path).parent.mkdir(parents=True, exist_ok=True)
+    writer = ChunkWriter(export_path)
+    rows_read = rows_written = 0
+
+    try:
+        reader = pd.read_csv(import_path, index_col=index_col, chunksize=chunksize, na_values=na_values, dtype=dtype)
+        for chunk in reader:
+            rows_read += len(chunk)
+            for step in steps:
+                chunk = step(chunk)
+            if duplicate_filter is not None:
+                chunk = duplicate_filter(chunk)
+            writer.write(chunk)
+            rows_written += len(chunk)
+    finally:
+        writer.close()
+
+    return rows_read, rows_written
@@ -0,0 +1,60 @@
+# --- Pandas Handbook: Compact Data Types ---
+# Shrinks DataFrames by inferring categoricals for low-cardinality strings and downcasting numeric columns
+
+
+# --- Import Libraries ---
+# Import pandas and numpy for data handling
+import pandas as pd
+import numpy as np
+
+
+# --- Read Options per Dataset ---
+# Extra read_csv arguments applied by load_dataset(..., compact=True) so columns get their type at read time
+# 'Unrated' becomes a missing value, which lets 'Stars' be parsed directly into a nullable float
+compact_read_options = {
+    'ramen': {'na_values': {'Stars': ['Unrated']}, 'dtype': {'Stars': 'Float32'}},
+}
+
+
+# --- Compacting ---
+def compact_frame(df, max_category_ratio=0.5, downcast_floats=True, arrow_strings=True):
+    """Return a copy of df with smaller data types.
+
+    Object columns with at most max_category_ratio unique values per row become categoricals,
+    the other object columns become Arrow-backed strings (arrow_strings=True). Integers are
+    downcast to the smallest type that holds their range and floats to float32 (about 7
+    significant digits, pass downcast_floats=False to keep float64).
+    """
+    compact_df = df.copy()
+
+    for column in compact_df.columns:
+        values = compact_df[column]
+
+        if values.dtype == object:
+            if len(values) and values.nunique() / len(values) <= max_category_ratio:
+                compact_df[column] = values.astype('category')
+            elif arrow_strings and pd.api.types.infer_dtype(values, skipna=True) == 'string':
+                compact_df[column] = values.astype('string[pyarrow]')
+        elif not isinstance(values.dtype, np.dtype):
+            # Extension types such as the nullable 'Float32' of compact_read_options are already compact
+            continue
+        elif values.dtype.kind in 'iu':
+            compact_df[column] = pd.to_numeric(values, downcast='integer' if values.dtype.kind == 'i' else 'unsigned')
+        elif values.dtype.kind == 'f' and downcast_floats:
+            compact_df[column] = values.astype('float32')
+
+    return compact_df
+
+
+# --- Memory Report ---
+def memory_report(before_df, after_df):
+    """Compare deep memory usage per column and in total, in bytes."""
+    report = pd.DataFrame({
+        'before_dtype': before_df.dtypes.astype(str),
+        'after_dtype': after_df.dtypes.astype(str),
+        'before_bytes': before_df.memory_usage(deep=True, index=False),
+        'after_bytes': after_df.memory_usage(deep=True, index=False),
+    })
+    report.loc['Total'] = ['', '', report['before_bytes'].sum(), report['after_bytes'].sum()]
+    report['reduction'] = (report['before_bytes'] / report['after_bytes']).round(2)
+    return report
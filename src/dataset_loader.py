@@ -0,0 +1,118 @@
+# --- Pandas Handbook: Shared Dataset Loader ---
+# Parses each handbook dataset once and keeps the typed result in an on-disk Parquet cache
+
+
+# --- Import Libraries ---
+# Import pandas and numpy for data handling, hashlib/json for cache keys and pathlib/os for file management
+import pandas as pd
+import numpy as np
+import hashlib
+import json
+import os
+from pathlib import Path
+from compact_dtypes import compact_frame, compact_read_options
+
+
+# --- Dataset Registry ---
+# Resolve the data folder relative to this file so the loader works from any working directory
+data_dir = Path(__file__).resolve().parent.parent / "data"
+cache_dir = data_dir / "cache"
+
+datasets = {
+    'ramen': data_dir / "raw" / "ramen-ratings.csv",
+    'titanic': data_dir / "raw" / "titanic.csv",
+    'clean_titanic': data_dir / "processed" / "clean_titanic.csv",
+    'weather': data_dir / "raw" / "weather.csv",
+}
+
+# Parsed frames already loaded by this process, keyed by cache key
+_loaded = {}
+
+
+# --- Cache Keys ---
+def file_digest(path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_digest(path):
+    """Return the content hash of a source file, rehashing only when its mtime or size changed."""
+    index_path = cache_dir / "index.json"
+    index = json.loads(index_path.read_text()) if index_path.exists() else {}
+
+    stat = path.stat()
+    entry = index.get(str(path))
+    if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+        return entry['sha256']
+
+    entry = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': file_digest(path)}
+    index[str(path)] = entry
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(index, indent=2))
+    os.replace(tmp_path, index_path)
+    return entry['sha256']
+
+
+def cache_key(path, read_kwargs, compact=False):
+    """Combine the source content hash, the read_csv arguments and the compact flag into one cache key."""
+    payload = json.dumps({'sha256': source_digest(path), 'read_kwargs': read_kwargs, 'compact': compact},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+# --- Loading ---
+def dataset_path(name):
+    """Return the source CSV path of a registered dataset."""
+    if name not in datasets:
+        raise KeyError(f"Unknown dataset {name!r}, expected one of {sorted(datasets)}")
+    return datasets[name]
+
+
+def load_dataset(name, compact=False, **read_kwargs):
+    """Load a registered dataset, parsing the CSV only when no cached copy exists.
+
+    Keyword arguments are passed to pd.read_csv and are part of the cache key, so different
+    read options ('index_col', 'parse_dates', 'na_values', ...) get their own cache entries.
+    With compact=True low-cardinality strings become categoricals, numbers are downcast and
+    dataset specific read options (like 'Stars' as a nullable float) are applied.
+    The returned frame is a handle: changing it never changes the cached copy.
+    """
+    path = dataset_path(name)
+    key = cache_key(path, read_kwargs, compact)
+
+    if key not in _loaded:
+        cache_path = cache_dir / f"{path.stem}-{key}.parquet"
+        if cache_path.exists():
+            # Restore 'string' columns as Arrow-backed strings, the way compact_frame() created them
+            with pd.option_context('mode.string_storage', 'pyarrow'):
+                df = pd.read_parquet(cache_path)
+            # Parquet restores missing strings as None, convert them back to NaN like read_csv does
+            for column in df.select_dtypes(include='object').columns:
+                df[column] = df[column].where(df[column].notna(), np.nan)
+        else:
+            if compact:
+                df = compact_frame(pd.read_csv(path, **{**compact_read_options.get(name, {}), **read_kwargs}))
+            else:
+                df = pd.read_csv(path, **read_kwargs)
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so parallel scripts never read a half-written cache
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            df.to_parquet(tmp_path, engine='pyarrow')
+            os.replace(tmp_path, cache_path)
+        _loaded[key] = df
+
+    # With copy-on-write a shallow copy already protects the cache, otherwise hand out a deep copy
+    return _loaded[key].copy(deep=pd.options.mode.copy_on_write is not True)
+
+
+def clear_cache():
+    """Forget loaded frames and remove all cached Parquet files."""
+    _loaded.clear()
+    if cache_dir.exists():
+        for file in cache_dir.iterdir():
+            file.unlink()
@@ -0,0 +1,147 @@
+# --- Pandas Handbook: Fixed-Format Date Parser ---
+# Parses ISO 'YYYY-MM-DD' date strings with integer arithmetic on their bytes, once per distinct date
+
+
+# --- Import Libraries ---
+# Import pandas and numpy for data handling, pyarrow for the string buffers and time/argparse for the benchmark
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import argparse
+import time
+
+
+# --- Detection ---
+date_width = 10
+digit_positions = [0, 1, 2, 3, 5, 6, 8, 9]
+
+
+def string_bytes(values):
+    """Return the characters of an Arrow string array as an (n, 10) uint8 view, or None if not all are 10 bytes long."""
+    if values.null_count or len(values) == 0:
+        return None
+    values = values.cast(pa.large_string())
+    offsets = np.frombuffer(values.buffers()[1], dtype=np.int64)[values.offset:values.offset + len(values) + 1]
+    if offsets[-1] - offsets[0] != len(values) * date_width or not (np.diff(offsets) == date_width).all():
+        return None
+    data = np.frombuffer(values.buffers()[2], dtype=np.uint8, count=len(values) * date_width, offset=int(offsets[0]))
+    return data.reshape(-1, date_width)
+
+
+def is_iso_date(chars):
+    """Check that every row of an (n, 10) byte view looks like YYYY-MM-DD."""
+    digits = chars[:, digit_positions]
+    return bool((chars[:, 4] == ord('-')).all() and (chars[:, 7] == ord('-')).all()
+                and ((digits >= ord('0')) & (digits <= ord('9'))).all())
+
+
+# --- Integer Kernel ---
+def days_from_civil(year, month, day):
+    """Days since 1970-01-01 of proleptic Gregorian dates, vectorized over int64 arrays."""
+    year = year - (month <= 2)
+    era = np.floor_divide(year, 400)
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+# Whole days that fit in datetime64[ns]: 1677-09-22 to 2262-04-11
+day_ns = 86_400_000_000_000
+first_day = -(np.iinfo(np.int64).max // day_ns)
+last_day = np.iinfo(np.int64).max // day_ns
+
+
+def parse_chars(chars):
+    """Turn an (n, 10) byte view of YYYY-MM-DD strings into datetime64[ns] values.
+
+    Raises pd.errors.OutOfBoundsDatetime, like pd.to_datetime(), for dates outside the datetime64[ns] range.
+    """
+    digits = chars[:, digit_positions].astype(np.int64) - ord('0')
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 4] * 10 + digits[:, 5]
+    day = digits[:, 6] * 10 + digits[:, 7]
+
+    month_length = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])[np.clip(month, 0, 12)]
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_length = month_length + ((month == 2) & leap)
+    invalid = (month < 1) | (month > 12) | (day < 1) | (day > month_length)
+    if invalid.any():
+        position = int(np.argmax(invalid))
+        raise ValueError(f"day or month out of range: {chars[position].tobytes().decode()!r} at position {position}")
+
+    days = days_from_civil(year, month, day)
+    out_of_bounds = (days < first_day) | (days > last_day)
+    if out_of_bounds.any():
+        position = int(np.argmax(out_of_bounds))
+        raise pd.errors.OutOfBoundsDatetime(
+            f"Out of bounds nanosecond timestamp: {chars[position].tobytes().decode()}, at position {position}")
+    return (days * day_ns).view('datetime64[ns]')
+
+
+# --- Parsing ---
+def parse_iso_dates(values, tz=None, cache=True):
+    """Parse a Series of 'YYYY-MM-DD' strings like pd.to_datetime(values, format='%Y-%m-%d').
+
+    With cache=True each distinct date is parsed (and localized) once and the results are taken
+    back out by code, which pays off when many rows share a date, e.g. one row per station and day.
+    With tz the dates are read as wall times in tz and returned tz-aware: pandas keeps them as int64
+    UTC plus the tz attribute, so later tz_convert calls only swap the attribute and never re-localize.
+    Values that are not fixed-width ISO dates (or missing values with cache=False) fall back to pd.to_datetime.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    strings = pa.chunked_array(pa.array(series.astype('string[pyarrow]').array)).combine_chunks()
+
+    codes = None
+    if cache:
+        encoded = pc.dictionary_encode(strings)
+        codes = np.asarray(encoded.indices.fill_null(-1))
+        strings = encoded.dictionary
+
+    chars = string_bytes(strings)
+    if chars is None or not is_iso_date(chars):
+        return pd.to_datetime(series, format='%Y-%m-%d').pipe(lambda dates: dates.dt.tz_localize(tz) if tz else dates)
+
+    dates = pd.DatetimeIndex(parse_chars(chars))
+    if tz is not None:
+        dates = dates.tz_localize(tz)
+    if codes is not None:
+        # Missing values have code -1 and become NaT
+        dates = dates.array.take(codes, allow_fill=True)
+    return pd.Series(dates, index=series.index, name=series.name)
+
+
+# --- Benchmark ---
+def benchmark(rows=100_000_000, days=3650, tz='UTC', target_tz='US/Pacific'):
+    """Compare parse_iso_dates with pd.to_datetime plus tz_localize/tz_convert on rows dates drawn from days distinct days."""
+    rng = np.random.default_rng(0)
+    distinct = pd.date_range('2012-01-01', periods=days, freq='D').strftime('%Y-%m-%d')
+    strings = pd.Series(pd.arrays.ArrowStringArray(pa.array(distinct.to_numpy(dtype=object)).take(
+        pa.array(rng.integers(0, days, rows)))))
+
+    results = []
+    start = time.perf_counter()
+    expected = pd.to_datetime(strings, format='%Y-%m-%d').dt.tz_localize(tz).dt.tz_convert(target_tz)
+    results.append({'method': 'to_datetime + tz_localize + tz_convert', 'seconds': time.perf_counter() - start})
+
+    for cache in (False, True):
+        start = time.perf_counter()
+        parsed = parse_iso_dates(strings, tz=tz, cache=cache).dt.tz_convert(target_tz)
+        results.append({'method': f'parse_iso_dates(cache={cache}) + tz_convert', 'seconds': time.perf_counter() - start})
+        if not parsed.equals(expected):
+            raise AssertionError(f"parse_iso_dates(cache={cache}) differs from pd.to_datetime")
+
+    report = pd.DataFrame(results)
+    report['speedup'] = report['seconds'].iloc[0] / report['seconds']
+    return report
+
+
+# --- Command Line ---
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark fixed-format ISO date parsing against pd.to_datetime")
+    parser.add_argument('--rows', type=int, default=100_000_000)
+    parser.add_argument('--days', type=int, default=3650, help="number of distinct dates in the data")
+    args = parser.parse_args()
+
+    print(benchmark(args.rows, args.days).round(3).to_string(index=False))
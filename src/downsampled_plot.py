@@ -0,0 +1,128 @@
+# --- Pandas Handbook: Downsampled Plotting ---
+# Reduces long series to about two points per pixel column before drawing, and pre-bins scatter and hexbin data
+
+
+# --- Import Libraries ---
+# Import pandas and numpy for data handling and matplotlib for the figure size in pixels
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+
+
+# --- Decimation ---
+def minmax_positions(values, buckets):
+    """Return the sorted positions of the first, last, smallest and largest value of each of buckets equal-sized buckets.
+
+    Keeping the extremes of every bucket keeps all peaks and dips visible at the pixel resolution.
+    """
+    values = np.asarray(values, dtype=float)
+    size = -(-len(values) // buckets)
+    padded = np.full(size * buckets, np.nan)
+    padded[:len(values)] = values
+    grid = padded.reshape(buckets, size)
+
+    # Missing values never win, a bucket without values selects its first position
+    lows = np.where(np.isnan(grid), np.inf, grid).argmin(axis=1)
+    highs = np.where(np.isnan(grid), -np.inf, grid).argmax(axis=1)
+    offsets = np.arange(buckets) * size
+    positions = np.concatenate([[0, len(values) - 1], offsets + lows, offsets + highs])
+    return np.unique(positions[positions < len(values)])
+
+
+def lttb_positions(x, y, points):
+    """Return the positions of points samples chosen with Largest-Triangle-Three-Buckets.
+
+    Each bucket keeps the sample forming the largest triangle with the previous kept sample and
+    the mean of the next bucket, which follows the visual shape of the line closely.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if points >= len(x) or points < 3:
+        return np.arange(len(x))
+
+    edges = np.linspace(1, len(x) - 1, points - 1).astype(int)
+    positions = [0]
+    for bucket in range(points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else len(x)
+        # An all-missing next bucket gives NaN areas, so the bucket keeps its first sample below
+        next_values = y[end:next_end][~np.isnan(y[end:next_end])]
+        next_x, next_y = x[end:next_end].mean(), next_values.mean() if len(next_values) else np.nan
+        previous = positions[-1]
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        positions.append(start + int(np.nanargmax(areas)) if not np.isnan(areas).all() else start)
+    positions.append(len(x) - 1)
+    return np.asarray(positions)
+
+
+def downsample(data, points, method='minmax'):
+    """Reduce a Series or DataFrame to roughly points rows per column, keeping the original index values.
+
+    For a DataFrame the rows selected for any column are kept, so every column keeps its peaks.
+    """
+    if len(data) <= points:
+        return data
+    columns = [data] if isinstance(data, pd.Series) else [data[name] for name in data.columns]
+    x = np.arange(len(data)) if not isinstance(data.index, pd.DatetimeIndex) else data.index.asi8
+    keep = []
+    for column in columns:
+        if not pd.api.types.is_numeric_dtype(column):
+            continue
+        if method == 'minmax':
+            keep.append(minmax_positions(column.to_numpy(dtype=float, na_value=np.nan), max(points // 2, 1)))
+        elif method == 'lttb':
+            keep.append(lttb_positions(x, column.to_numpy(dtype=float, na_value=np.nan), points))
+        else:
+            raise ValueError(f"method must be 'minmax' or 'lttb', got {method!r}")
+    return data.iloc[np.unique(np.concatenate(keep))] if keep else data
+
+
+# --- Plotting ---
+def pixel_width(ax=None, figsize=None):
+    """Width in pixels of the axes, or of a new figure of figsize (default rcParams) if there is no axes yet."""
+    if ax is not None:
+        return int(ax.get_window_extent().width)
+    width, _ = figsize if figsize is not None else plt.rcParams['figure.figsize']
+    return int(width * plt.rcParams['figure.dpi'])
+
+
+def plot_downsampled(data, method='minmax', points_per_pixel=2, **plot_kwargs):
+    """Like data.plot(**plot_kwargs) but draws at most about points_per_pixel points per pixel column.
+
+    An xlim is applied to the data before it is reduced, so zoomed plots keep their full detail.
+    The number of drawn vertices, and with it the drawing time, no longer grows with the series.
+    """
+    if 'xlim' in plot_kwargs and isinstance(data.index, pd.DatetimeIndex):
+        low, high = plot_kwargs['xlim']
+        data = data.loc[low:high]
+    points = pixel_width(plot_kwargs.get('ax'), plot_kwargs.get('figsize')) * points_per_pixel
+    return downsample(data, points, method).plot(**plot_kwargs)
+
+
+# --- Pre-Binning ---
+def prebin(df, x, y, bins=512):
+    """Count the rows of df on a bins x bins grid over x and y and return the non-empty cells as x, y, count rows."""
+    values = df[[x, y]].dropna()
+    counts, x_edges, y_edges = np.histogram2d(values[x], values[y], bins=bins)
+    x_cells, y_cells = np.nonzero(counts)
+    return pd.DataFrame({
+        x: (x_edges[x_cells] + x_edges[x_cells + 1]) / 2,
+        y: (y_edges[y_cells] + y_edges[y_cells + 1]) / 2,
+        'count': counts[x_cells, y_cells].astype(np.int64),
+    })
+
+
+def plot_scatter(df, x, y, bins=512, max_points=100_000, **plot_kwargs):
+    """Like df.plot(kind='scatter', x=x, y=y), above max_points rows one marker is drawn per occupied grid cell."""
+    if len(df) > max_points:
+        df = prebin(df, x, y, bins)
+    return df.plot(kind='scatter', x=x, y=y, **plot_kwargs)
+
+
+def plot_hexbin(df, x, y, gridsize=100, max_points=100_000, **plot_kwargs):
+    """Like df.plot(kind='hexbin', x=x, y=y), above max_points rows hexagons are filled from pre-binned cell counts."""
+    if len(df) <= max_points:
+        return df.plot(kind='hexbin', x=x, y=y, gridsize=gridsize, **plot_kwargs)
+    cells = prebin(df, x, y, bins=4 * gridsize)
+    return cells.plot(kind='hexbin', x=x, y=y, C='count', reduce_C_function=np.sum, gridsize=gridsize, **plot_kwargs)
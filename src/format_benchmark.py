@@ -0,0 +1,122 @@
+# --- Pandas Handbook: File Format Benchmark ---
+# Measures the import & export round-trips of 02_import_export.py: write time, read time, peak memory and file size
+
+
+# --- Import Libraries ---
+# Import pandas for data handling, the shared time and peak memory measurement and argparse/tempfile for running the suite
+import pandas as pd
+import argparse
+import tempfile
+from pathlib import Path
+from sqlalchemy import create_engine
+from dataset_loader import data_dir, load_dataset
+from measurement import measure
+
+
+# --- Round-Trip Definitions ---
+# Each format maps to a file suffix, a writer and a reader that mirror the calls in 02_import_export.py
+def sql_writer(df, path):
+    engine = create_engine(f"sqlite:///{path}")
+    df.to_sql('sample_table', engine, if_exists='replace')
+    engine.dispose()
+
+
+def sql_reader(path):
+    engine = create_engine(f"sqlite:///{path}")
+    df = pd.read_sql('sample_table', engine, index_col='Review #')
+    engine.dispose()
+    return df
+
+
+formats = {
+    'csv': ('.csv', lambda df, path: df.to_csv(path), lambda path: pd.read_csv(path, index_col='Review #')),
+    'tsv': ('.tsv', lambda df, path: df.to_csv(path, sep='\t'), lambda path: pd.read_csv(path, sep='\t', index_col='Review #')),
+    'excel': ('.xlsx', lambda df, path: df.to_excel(path), lambda path: pd.read_excel(path, index_col='Review #')),
+    'json': ('.json', lambda df, path: df.to_json(path), lambda path: pd.read_json(path)),
+    'html': ('.html', lambda df, path: df.to_html(path), lambda path: pd.read_html(path)[0]),
+    'sql': ('.db', sql_writer, sql_reader),
+    'feather': ('.feather', lambda df, path: df.reset_index().to_feather(path), lambda path: pd.read_feather(path)),
+}
+
+# Parquet is measured for every compression codec
+for codec in ['snappy', 'zstd', 'gzip']:
+    formats[f'parquet-{codec}'] = (
+        '.parquet',
+        lambda df, path, codec=codec: df.to_parquet(path, engine='pyarrow', compression=codec),
+        lambda path: pd.read_parquet(path),
+    )
+
+# HDF5 is measured for several blosc compression levels
+for level in [0, 1, 5, 9]:
+    formats[f'hdf-blosc{level}'] = (
+        '.h5',
+        lambda df, path, level=level: df.to_hdf(path, key='df', mode='w', format='table', complib='blosc', complevel=level),
+        lambda path: pd.read_hdf(path, key='df'),
+    )
+
+
+# --- Synthetic Scaling ---
+def scale_dataset(df, factor):
+    """Repeat the rows factor times, shifting 'Review #' so the index stays unique."""
+    if factor == 1:
+        return df
+    step = df.index.max()
+    parts = [df.set_axis(df.index + i * step) for i in range(factor)]
+    return pd.concat(parts)
+
+
+def run_benchmark(df, scales=(1, 10, 100), format_names=None, repeat=1, work_dir=None):
+    """Benchmark every format at every scale and return one row per measurement."""
+    format_names = format_names or list(formats)
+    records = []
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        for factor in scales:
+            scaled_df = scale_dataset(df, factor)
+
+            for name in format_names:
+                suffix, writer, reader = formats[name]
+                path = Path(tmp_dir) / f"ramen-ratings-{factor}x-{name}{suffix}"
+
+                for run in range(repeat):
+                    path.unlink(missing_ok=True)
+                    _, write_s, write_peak, write_traced = measure(writer, scaled_df, path)
+                    read_df, read_s, read_peak, read_traced = measure(reader, path)
+
+                    records.append({
+                        'format': name,
+                        'scale': factor,
+                        'rows': len(scaled_df),
+                        'run': run,
+                        'write_s': round(write_s, 4),
+                        'read_s': round(read_s, 4),
+                        'write_peak_mb': round(write_peak / 1024 ** 2, 2),
+                        'read_peak_mb': round(read_peak / 1024 ** 2, 2),
+                        'write_traced_mb': round(write_traced / 1024 ** 2, 2),
+                        'read_traced_mb': round(read_traced / 1024 ** 2, 2),
+                        'size_kb': round(path.stat().st_size / 1024, 2),
+                        'rows_read': len(read_df),
+                    })
+                    print(f"{name:<14} {factor:>4}x  write {write_s:8.3f}s  read {read_s:8.3f}s  "
+                          f"size {records[-1]['size_kb']:>12} KB")
+
+    return pd.DataFrame(records)
+
+
+# --- Command Line ---
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the file formats of 02_import_export.py")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--formats', nargs='+', choices=list(formats), default=None)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--output', type=Path, default=data_dir / "benchmarks" / "format-benchmark.csv")
+    args = parser.parse_args()
+
+    ramen_df = load_dataset('ramen', index_col='Review #')
+    results_df = run_benchmark(ramen_df, scales=args.scales, format_names=args.formats, repeat=args.repeat)
+
+    # Write the results table as CSV and JSON for downstream tooling
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    results_df.to_csv(args.output, index=False)
+    results_df.to_json(args.output.with_suffix('.json'), orient='records', indent=2)
+    print(f"Results saved to {args.output}")
@@ -0,0 +1,91 @@
+# --- Pandas Handbook: Grouped Predicate Aggregation ---
+# Counts matches of a string predicate per group with one vectorized mask instead of a Python call per group
+
+
+# --- Import Libraries ---
+# Import pandas and numpy for data handling, argparse/time for the benchmark
+import pandas as pd
+import numpy as np
+import argparse
+import time
+
+
+# --- Grouped Predicate ---
+class GroupedPredicate:
+    """Group a DataFrame once and reduce boolean string masks per group.
+
+    GroupedPredicate(df, ['Survived', 'Pclass']).sum('Name', 'Mrs.') returns the same Series as
+    df.groupby(['Survived', 'Pclass'])['Name'].apply(lambda x: x.str.contains('Mrs.').sum()).
+    Masks and results are cached per (column, pattern, options), so repeated calls are free.
+    The cache assumes the DataFrame is not modified afterwards.
+    """
+
+    def __init__(self, df, by):
+        self.df = df
+        grouped = df.groupby(by)
+        self.result_index = grouped.size().index
+        self.ngroups = grouped.ngroups
+
+        # Rows with a missing group key get NaN from ngroup() and are left out like in groupby()
+        codes = grouped.ngroup().to_numpy()
+        self.valid = ~np.isnan(codes)
+        self.codes = codes[self.valid].astype(np.intp)
+        self.masks = {}
+        self.results = {}
+
+    def mask(self, column, pat, **contains_kwargs):
+        """Return the cached boolean mask of column.str.contains(pat) over the whole column."""
+        key = (column, pat, tuple(sorted(contains_kwargs.items())))
+        if key not in self.masks:
+            # Missing values count as no match
+            matches = self.df[column].str.contains(pat, **{'na': False, **contains_kwargs})
+            self.masks[key] = matches.to_numpy(dtype=bool)
+        return self.masks[key]
+
+    def sum(self, column, pat, **contains_kwargs):
+        """Count the rows per group whose column contains pat."""
+        key = (column, pat, tuple(sorted(contains_kwargs.items())))
+        if key not in self.results:
+            mask = self.mask(column, pat, **contains_kwargs)[self.valid]
+            counts = np.bincount(self.codes, weights=mask, minlength=self.ngroups).astype('int64')
+            self.results[key] = pd.Series(counts, index=self.result_index, name=column)
+        return self.results[key].copy()
+
+
+# --- Benchmark ---
+def synthetic_titanic(df, rows, seed=0):
+    """Sample rows of the Titanic dataset with replacement to build a larger synthetic frame."""
+    rng = np.random.default_rng(seed)
+    positions = rng.integers(0, len(df), size=rows)
+    return df.iloc[positions].reset_index(drop=True)
+
+
+def benchmark(df, by=('Survived', 'Pclass'), column='Name', pat='Mrs.', calls=3):
+    """Time repeated apply-per-group calls against the cached grouped predicate."""
+    by = list(by)
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        expected = df.groupby(by)[column].apply(lambda x: x.str.contains(pat).sum())
+    apply_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predicate = GroupedPredicate(df, by)
+    for _ in range(calls):
+        result = predicate.sum(column, pat)
+    predicate_s = time.perf_counter() - start
+
+    pd.testing.assert_series_equal(result, expected)
+    return {'rows': len(df), 'calls': calls, 'apply_s': round(apply_s, 3), 'predicate_s': round(predicate_s, 3)}
+
+
+if __name__ == '__main__':
+    from dataset_loader import load_dataset
+
+    parser = argparse.ArgumentParser(description="Benchmark grouped predicate counting against groupby apply")
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--calls', type=int, default=3)
+    args = parser.parse_args()
+
+    titanic_df = load_dataset('clean_titanic', index_col="PassengerId")
+    print(benchmark(synthetic_titanic(titanic_df, args.rows), calls=args.calls))
@@ -0,0 +1,114 @@
+# --- Pandas Handbook: HDF5 Query-on-Read ---
+# Writes HDF5 tables with indexed data columns so the selections of 04_data_selection.py read only matching rows
+
+
+# --- Import Libraries ---
+# Import pandas for data handling (HDFStore requires the pytables library installed), argparse/time for the benchmark
+import pandas as pd
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+# Columns that can appear in where= conditions, 'Stars' is stored as a number so it can be compared with < and >
+query_columns = ('Country', 'Brand', 'Style', 'Stars')
+numeric_query_columns = ('Stars',)
+
+
+# --- Writing ---
+def write_query_table(df, path, key='df', data_columns=query_columns, numeric_columns=numeric_query_columns,
+                      complib='blosc', complevel=9):
+    """Write df as an HDF5 table whose data_columns are stored as separate, fully indexed columns.
+
+    Data columns can be used in where= conditions of read_where() and pd.read_hdf(); PyTables
+    answers those conditions from the column indexes and only decompresses the chunks that
+    hold matching rows. numeric_columns are converted with pd.to_numeric(), values that are not
+    numbers ('Unrated') are stored as NaN. The index can always be queried as 'index'.
+    """
+    df = df.assign(**{column: pd.to_numeric(df[column], errors='coerce') for column in numeric_columns})
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with pd.HDFStore(tmp_path, mode='w', complib=complib, complevel=complevel) as store:
+        # Index once after writing: optlevel 9 'full' indexes cost more to build but answer queries fastest
+        store.append(key, df, format='table', data_columns=list(data_columns), index=False)
+        store.create_table_index(key, columns=list(data_columns), optlevel=9, kind='full')
+    os.replace(tmp_path, path)
+
+
+# --- Reading ---
+def read_where(path, where=None, columns=None, key='df'):
+    """Read only the rows matching where and only the given columns of a table written by write_query_table().
+
+    where uses DataFrame.query() syntax on data columns and the index, for example
+    "Country == 'Japan' and Stars >= 4.5", "Country in ['Japan', 'Taiwan']" or "index > 2500",
+    or a list of such conditions that must all hold.
+    """
+    with pd.HDFStore(path, mode='r') as store:
+        storer = store.get_storer(key)
+        if not storer.is_table:
+            raise ValueError(f"{path} stores {key!r} in fixed format, write it with write_query_table() to query it")
+        return store.select(key, where=where, columns=columns)
+
+
+# --- Benchmark ---
+benchmark_queries = [
+    ("Country == 'Japan' and Stars >= 4.5", None),
+    ("Brand == 'Yamachan' and Stars > 4.5", ['Brand', 'Stars']),
+    ("Country in ['Japan', 'South Korea']", ['Brand', 'Variety', 'Style']),
+]
+
+
+def timed(func, repeat):
+    """Return the result of func and its best time over repeat runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def benchmark(df, scale=100, levels=(0, 1, 5, 9), queries=None, repeat=3, work_dir=None):
+    """Compare read_where() with a full pd.read_hdf() plus an in-memory DataFrame.query() at several blosc levels."""
+    from format_benchmark import scale_dataset
+
+    queries = queries or benchmark_queries
+    large_df = scale_dataset(df, scale)
+    results = []
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        for level in levels:
+            path = Path(tmp_dir) / f"ramen-ratings-blosc{level}.h5"
+            _, write_s = timed(lambda: write_query_table(large_df, path, complevel=level), 1)
+
+            for where, columns in queries:
+                def full_read():
+                    selection = pd.read_hdf(path, key='df').query(where)
+                    return selection if columns is None else selection[columns]
+
+                expected, full_s = timed(full_read, repeat)
+                selection, where_s = timed(lambda: read_where(path, where, columns), repeat)
+                if not selection.equals(expected):
+                    raise AssertionError(f"read_where() differs from read_hdf().query() for {where!r}")
+
+                results.append({'complevel': level, 'where': where, 'columns': columns, 'rows': len(selection),
+                                'size_kb': path.stat().st_size / 1024, 'write_s': write_s,
+                                'read_filter_s': full_s, 'where_s': where_s, 'speedup': full_s / where_s})
+
+    return pd.DataFrame(results)
+
+
+# --- Command Line ---
+if __name__ == '__main__':
+    from dataset_loader import load_dataset
+
+    parser = argparse.ArgumentParser(description="Benchmark HDF5 where= reads against a full read and filter")
+    parser.add_argument('--scale', type=int, default=100, help="repeat the ramen ratings this many times")
+    parser.add_argument('--levels', type=int, nargs='+', default=[0, 1, 5, 9])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    ramen_df = load_dataset('ramen', index_col='Review #')
+    print(benchmark(ramen_df, args.scale, args.levels, repeat=args.repeat).round(3).to_string(index=False))
@@ -0,0 +1,119 @@
+# --- Pandas Handbook: Incremental Parquet & HDF5 Writer ---
+# Appends only rows with a key above the last written high-water mark instead of rewriting the whole file
+
+
+# --- Import Libraries ---
+# Import pandas for data handling, json/os for the manifest and pyarrow for reading single Parquet columns
+import pandas as pd
+import json
+import os
+import pyarrow.dataset as ds
+from pathlib import Path
+
+
+# --- Manifest ---
+# A small JSON file next to the output remembers the key column, the high-water mark and what was written
+def manifest_path(path):
+    path = Path(path)
+    return path.with_name(f"{path.name}.manifest.json")
+
+
+def read_manifest(path):
+    """Return the manifest of an output, or None if it has none yet."""
+    file = manifest_path(path)
+    if file.exists():
+        return json.loads(file.read_text())
+    return None
+
+
+def write_manifest(path, manifest):
+    file = manifest_path(path)
+    tmp_file = file.with_name(f".{file.name}.{os.getpid()}.tmp")
+    tmp_file.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp_file, file)
+
+
+def key_values(df, key):
+    """Return the key as a Series, whether it is a column or an index level."""
+    if key in df.columns:
+        return df[key]
+    return pd.Series(df.index.get_level_values(key), index=df.index)
+
+
+def scan_high_water_mark(path, key, file_format):
+    """Read only the key of existing output to find its highest value."""
+    if file_format == 'parquet':
+        values = ds.dataset(path, format='parquet').to_table(columns=[key]).column(key).to_pandas()
+    else:
+        with pd.HDFStore(path, mode='r') as store:
+            # Zero rows are enough to tell whether the key is stored as the index or as a column
+            index_names = store.select('df', stop=0).index.names
+            values = key_values(store.select('df', columns=[] if key in index_names else [key]), key)
+    return None if values.empty else values.max().item()
+
+
+# --- Appenders ---
+def append_parquet(new_df, path):
+    """Write the new rows as one more part file of a Parquet dataset directory."""
+    path.mkdir(parents=True, exist_ok=True)
+    part_number = len(list(path.glob("part-*.parquet")))
+    part_file = path / f"part-{part_number:05d}.parquet"
+    tmp_file = path / f".part-{part_number:05d}.{os.getpid()}.tmp"
+    new_df.to_parquet(tmp_file, engine='pyarrow', compression='snappy')
+    os.replace(tmp_file, part_file)
+    return part_file.name
+
+
+def append_hdf(new_df, path, min_string_size=256, **hdf_kwargs):
+    """Append the new rows to an HDF5 table.
+
+    String columns get their width from the first write, so they are reserved at min_string_size
+    characters (or the longest value) to leave room for longer strings in later appends.
+    """
+    min_itemsize = {}
+    for column in new_df.columns:
+        if new_df[column].dtype == object:
+            # max() is NaN when the column only holds missing values
+            longest = new_df[column].str.len().max()
+            min_itemsize[column] = max(min_string_size, 0 if pd.isna(longest) else int(longest))
+    new_df.to_hdf(path, key='df', mode='a', format='table', append=True, min_itemsize=min_itemsize, **hdf_kwargs)
+    return path.name
+
+
+# --- Incremental Writes ---
+def append_new_rows(df, path, key='Review #', **hdf_kwargs):
+    """Append the rows of df whose key is above the high-water mark of path and return how many were written.
+
+    Paths ending in .parquet are written as a directory of part files (one per refresh, read back
+    with pd.read_parquet(path)); paths ending in .h5 are appended to a table format HDF5 file.
+    Extra keyword arguments such as complib='blosc', complevel=9 are passed to to_hdf().
+    """
+    path = Path(path)
+    file_format = 'parquet' if path.suffix == '.parquet' else 'hdf'
+    if file_format == 'parquet' and path.is_file():
+        raise ValueError(f"{path} is a single Parquet file, incremental output needs a dataset directory")
+
+    manifest = read_manifest(path)
+    if manifest is None:
+        high_water_mark = scan_high_water_mark(path, key, file_format) if path.exists() else None
+        manifest = {'key': key, 'format': file_format, 'high_water_mark': high_water_mark, 'rows': 0, 'parts': []}
+    elif manifest['key'] != key:
+        raise ValueError(f"{path} is keyed on {manifest['key']!r}, not {key!r}")
+
+    keys = key_values(df, key)
+    new_df = df if manifest['high_water_mark'] is None else df[keys > manifest['high_water_mark']]
+    if new_df.empty:
+        return 0
+
+    # Keep the output in key order so the next high-water mark is simply the last key
+    new_df = new_df.iloc[key_values(new_df, key).argsort(kind='stable')]
+    if file_format == 'parquet':
+        part = append_parquet(new_df, path)
+    else:
+        part = append_hdf(new_df, path, **hdf_kwargs)
+
+    manifest['high_water_mark'] = key_values(new_df, key).max().item()
+    manifest['rows'] += len(new_df)
+    manifest['parts'].append({'name': part, 'rows': len(new_df)})
+    write_manifest(path, manifest)
+    return len(new_df)
@@ -0,0 +1,155 @@
+# --- Pandas Handbook: Persistent Lookup Index ---
+# Sorted key array and inverted indexes stored as .npy files and loaded with mmap for fast repeated lookups
+
+
+# --- Import Libraries ---
+# Import pandas and numpy for data handling, hashlib to fingerprint the data and json/pathlib for the index folder
+import pandas as pd
+import numpy as np
+import hashlib
+import json
+from pathlib import Path
+
+
+# --- Building the Index ---
+def columns_digest(df, key, inverted):
+    """SHA-256 of the key and inverted columns in row order, the data the index positions point into."""
+    keys = df.index.get_level_values(key) if key in df.index.names else df[key]
+    frame = df[list(inverted)].assign(**{'__key__': np.asarray(keys)})
+    return hashlib.sha256(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def build_index(df, path, key='Review #', inverted=('Brand', 'Country', 'Style'), source_digest=None):
+    """Build a lookup index for df and store it in the folder path.
+
+    The key is stored as a sorted array with the row position of every key, so a key lookup is
+    a binary search. Each inverted column stores its distinct values and, per value, the row
+    positions that hold it (CSR layout), so an equality filter is one dict lookup and one slice.
+    source_digest (see dataset_loader.source_digest()) records which file df was loaded from.
+
+    Object arrays cannot be memory-mapped, so string keys are stored as a fixed-width unicode
+    array (4 bytes per character of the longest key); other non-numeric keys raise TypeError.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    keys = df.index.get_level_values(key) if key in df.index.names else df[key]
+    keys = np.asarray(keys)
+    if keys.dtype == object:
+        if not all(isinstance(value, str) for value in keys):
+            raise TypeError(f"Key {key!r} must be numeric, datetime or all strings without missing values "
+                            f"to be stored as a memory-mapped array")
+        keys = keys.astype(str)
+    order = np.argsort(keys, kind='stable')
+    np.save(path / "key.npy", keys[order])
+    np.save(path / "key_rows.npy", order.astype(np.int64))
+
+    values = {}
+    for column in inverted:
+        codes, uniques = pd.factorize(df[column], use_na_sentinel=True)
+        rows = np.argsort(codes, kind='stable').astype(np.int64)
+        # rows[offsets[c + 1]:offsets[c + 2]] holds the rows with code c, rows[offsets[0]:offsets[1]] the missing values
+        counts = np.bincount(codes + 1, minlength=len(uniques) + 1)
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        np.save(path / f"{column}.rows.npy", rows)
+        np.save(path / f"{column}.offsets.npy", offsets)
+        values[column] = uniques.tolist()
+
+    meta = {'key': key, 'rows': len(df), 'unique_key': bool(pd.Index(keys).is_unique),
+            'source_digest': source_digest, 'columns_digest': columns_digest(df, key, inverted), 'inverted': values}
+    (path / "index.json").write_text(json.dumps(meta, indent=2, default=str))
+
+
+def index_is_current(path, source_digest):
+    """True if an index exists at path and was built from the source with this digest."""
+    meta_file = Path(path) / "index.json"
+    return meta_file.exists() and json.loads(meta_file.read_text()).get('source_digest') == source_digest
+
+
+# --- Using the Index ---
+class LookupIndex:
+    """Memory-mapped lookup index built by build_index().
+
+    Lookups return row positions, which select rows of the indexed DataFrame with df.iloc. The
+    arrays are memory-mapped, so many processes can share one page-cached copy of the index.
+    """
+
+    def __init__(self, path):
+        path = Path(path)
+        self.meta = json.loads((path / "index.json").read_text())
+        self.key = self.meta['key']
+        self.sorted_keys = np.load(path / "key.npy", mmap_mode='r')
+        self.key_rows = np.load(path / "key_rows.npy", mmap_mode='r')
+        self.inverted = {}
+        for column, values in self.meta['inverted'].items():
+            self.inverted[column] = (
+                {value: code for code, value in enumerate(values)},
+                np.load(path / f"{column}.offsets.npy", mmap_mode='r'),
+                np.load(path / f"{column}.rows.npy", mmap_mode='r'),
+            )
+
+    def check(self, df, source_digest=None):
+        """Raise if df is not the data the index was built for.
+
+        Compares the row count, the key and inverted columns (hashed in row order) and, when
+        given, the digest of the source file, so a changed dataset never returns wrong rows.
+        """
+        if len(df) != self.meta['rows']:
+            raise ValueError(f"Index was built for {self.meta['rows']} rows, DataFrame has {len(df)}")
+        if source_digest is not None and source_digest != self.meta.get('source_digest'):
+            raise ValueError("Index was built from a different version of the source file, rebuild it")
+        if columns_digest(df, self.key, self.inverted) != self.meta.get('columns_digest'):
+            raise ValueError(f"Index was built for different values of {[self.key, *self.inverted]}, rebuild it")
+
+    # --- Key Lookups ---
+    def positions(self, keys):
+        """Return the row positions of keys with binary search, -1 where a key does not exist."""
+        keys = np.atleast_1d(np.asarray(keys))
+        found = np.searchsorted(self.sorted_keys, keys)
+        found = np.minimum(found, len(self.sorted_keys) - 1)
+        hit = self.sorted_keys[found] == keys
+        return np.where(hit, self.key_rows[found], -1)
+
+    def loc(self, df, keys, columns=None):
+        """Like df.loc[keys, columns] for a list of keys, without scanning the key column."""
+        positions = self.positions(keys)
+        if (positions < 0).any():
+            raise KeyError(f"{np.asarray(keys)[positions < 0].tolist()} not in index")
+        rows = df.iloc[positions]
+        return rows if columns is None else rows[columns]
+
+    def at(self, df, key, column):
+        """Like df.at[key, column]."""
+        return self.loc(df, [key], [column]).iat[0, 0]
+
+    def align(self, df, keys):
+        """Return the rows of df matching keys in that order with NaN rows for missing keys (a left join on the key)."""
+        positions = self.positions(keys)
+        rows = df.iloc[np.where(positions < 0, 0, positions)].reset_index(drop=True)
+        if (positions < 0).any():
+            rows = rows.where(pd.Series(positions >= 0), axis=0)
+        return rows.set_axis(pd.Index(np.atleast_1d(keys), name=self.key))
+
+    # --- Equality Filters ---
+    def equals(self, column, value):
+        """Return the row positions where column == value, in row order."""
+        codes, offsets, rows = self.inverted[column]
+        code = codes.get(value)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        # Code c is stored at slot c + 1, slot 0 holds the rows with a missing value
+        return np.asarray(rows[offsets[code + 1]:offsets[code + 2]])
+
+    def isin(self, column, values):
+        """Return the row positions where column is one of values, in row order."""
+        return np.sort(np.concatenate([self.equals(column, value) for value in values]))
+
+    def filter(self, df, **conditions):
+        """Like df[(df[col1] == value1) & (df[col2] == value2) ...] using the inverted indexes."""
+        if not conditions:
+            raise ValueError("filter() needs at least one column=value condition")
+        positions = None
+        for column, value in conditions.items():
+            rows = self.equals(column, value)
+            positions = rows if positions is None else np.intersect1d(positions, rows, assume_unique=True)
+        return df.iloc[positions]
@@ -0,0 +1,80 @@
+# --- Pandas Handbook: Measurement ---
+# Time and peak memory of a function call, shared by the benchmarks and the section profile
+
+
+# --- Import Libraries ---
+# Import psutil for the resident memory, tracemalloc for Python allocations and pyarrow to release its memory pool
+import pyarrow as pa
+import contextlib
+import ctypes
+import gc
+import sys
+import threading
+import time
+import tracemalloc
+import psutil
+
+
+# --- Resident Memory ---
+class RssSampler:
+    """Sample the resident memory of this process and its worker processes in a background thread."""
+
+    def __init__(self, interval=0.005):
+        self.process = psutil.Process()
+        self.interval = interval
+        self.peak = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+
+    def rss(self):
+        total = self.process.memory_info().rss
+        for child in self.process.children(recursive=True):
+            with contextlib.suppress(psutil.Error):
+                total += child.memory_info().rss
+        return total
+
+    def sample(self):
+        while not self.stopped.wait(self.interval):
+            self.peak = max(self.peak, self.rss())
+
+    def reset(self):
+        self.peak = self.rss()
+        return self.peak
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+
+# --- Measurement ---
+def release_free_memory():
+    """Hand memory freed by earlier runs back to the OS, so it cannot be reused without showing up in the RSS."""
+    gc.collect()
+    pa.default_memory_pool().release_unused()
+    if sys.platform.startswith('linux'):
+        ctypes.CDLL(None).malloc_trim(0)
+
+
+def measure(func, *args):
+    """Run func and return its result, the elapsed seconds, the peak RSS growth and the peak traced memory in bytes.
+
+    The RSS peak is sampled every few milliseconds and covers every allocator, including the
+    buffers of Arrow, HDF5/blosc and lxml. tracemalloc only sees Python and NumPy allocations,
+    it is reported next to it to show how much of the peak is Python objects. Memory the
+    process still holds is released first, see release_free_memory().
+    """
+    release_free_memory()
+    with RssSampler() as sampler:
+        rss_start = sampler.reset()
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        traced_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        rss_peak = max(sampler.peak, sampler.rss())
+    return result, elapsed, rss_peak - rss_start, traced_peak
@@ -0,0 +1,81 @@
+# --- Pandas Handbook: Two-Pass Grouped Median Imputation ---
+# Fills missing values with the median of their group without loading the whole file into memory
+
+
+# --- Import Libraries ---
+# Import pandas for data handling and the chunk writer of the chunked cleaner for the output pass
+import pandas as pd
+from pathlib import Path
+from chunked_cleaning import ChunkWriter
+
+
+# --- Grouped Median Imputer ---
+class GroupMedianImputer:
+    """Exact per-group median imputation in two streaming passes.
+
+    The first pass keeps a count per distinct (group, value) pair instead of the values themselves,
+    so memory grows with the number of distinct ages per group, not with the number of rows.
+    The second pass fills missing values chunk by chunk with one vectorized lookup.
+    Matches df.groupby(by)[column].transform(lambda x: x.fillna(x.median())).
+    """
+
+    def __init__(self, by, column):
+        self.by = list(by)
+        self.column = column
+        self.counts = None
+        self.medians = None
+
+    # --- First Pass ---
+    def partial_fit(self, chunk):
+        """Add the value counts of one chunk to the running per-group counts."""
+        chunk_counts = chunk.groupby(self.by + [self.column]).size()
+        if self.counts is None:
+            self.counts = chunk_counts
+        else:
+            self.counts = self.counts.add(chunk_counts, fill_value=0).astype('int64')
+        self.medians = None
+        return self
+
+    def fit_csv(self, import_path, chunksize=100_000, **read_kwargs):
+        """Run the first pass over a CSV, reading only the group and value columns."""
+        usecols = self.by + [self.column]
+        for chunk in pd.read_csv(import_path, usecols=usecols, chunksize=chunksize, **read_kwargs):
+            self.partial_fit(chunk)
+        return self
+
+    def group_medians(self):
+        """Return the exact median per group computed from the value counts."""
+        if self.medians is None:
+            counts = self.counts.sort_index()
+            levels = list(range(len(self.by)))
+            table = pd.DataFrame({
+                'value': counts.index.get_level_values(self.column),
+                'cum': counts.groupby(level=levels).cumsum().to_numpy(),
+                'n': counts.groupby(level=levels).transform('sum').to_numpy(),
+            }, index=counts.index.droplevel(self.column))
+
+            # The median is the mean of the values at the two middle positions (the same one for odd counts)
+            lower = table[table['cum'] > (table['n'] - 1) // 2].groupby(level=levels)['value'].first()
+            upper = table[table['cum'] > table['n'] // 2].groupby(level=levels)['value'].first()
+            self.medians = (lower + upper) / 2
+            self.medians.name = self.column
+        return self.medians
+
+    # --- Second Pass ---
+    def transform(self, chunk):
+        """Fill missing values of one chunk with the median of their group."""
+        medians = self.group_medians()
+        keys = pd.MultiIndex.from_frame(chunk[self.by]) if len(self.by) > 1 else pd.Index(chunk[self.by[0]])
+        fill_values = medians.reindex(keys).to_numpy()
+        chunk[self.column] = chunk[self.column].fillna(pd.Series(fill_values, index=chunk.index))
+        return chunk
+
+    def transform_csv(self, import_path, export_path, chunksize=100_000, **read_kwargs):
+        """Run the second pass over a CSV and append the filled chunks to export_path (.csv or .parquet)."""
+        Path(export_path).parent.mkdir(parents=True, exist_ok=True)
+        writer = ChunkWriter(export_path)
+        try:
+            for chunk in pd.read_csv(import_path, chunksize=chunksize, **read_kwargs):
+                writer.write(self.transform(chunk))
+        finally:
+            writer.close()
@@ -0,0 +1,129 @@
+# --- Pandas Handbook: Script Memory Profile ---
+# Runs handbook scripts in fresh processes and reports their peak traced memory, or that of the sections changed since a git revision
+
+
+# --- Import Libraries ---
+# Import pandas for the report, subprocess/sys to run scripts, runpy/tracemalloc to measure them and json/tempfile
+# to collect the results
+import pandas as pd
+import argparse
+import contextlib
+import json
+import os
+import re
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+
+# Code run in the child process: call a function of a module in this folder with the script, the result file
+# and JSON encoded arguments
+runner = """
+import importlib, json, sys
+sys.path.insert(0, sys.argv[1])
+function = getattr(importlib.import_module(sys.argv[2]), sys.argv[3])
+function(sys.argv[4], sys.argv[5], *map(json.loads, sys.argv[6:]))
+"""
+
+
+# --- Running Scripts ---
+def run_in_child(script, module, function, *args):
+    """Run module.function(script, result_file, *args) in a new Python process from the script's folder.
+
+    The function runs the script and writes its measurements as JSON to result_file, which is
+    returned decoded. Plots go to the non-interactive Agg backend.
+    """
+    script = Path(script).resolve()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        result_file = Path(tmp_dir) / "result.json"
+        env = {**os.environ, 'MPLBACKEND': 'Agg'}
+        subprocess.run([sys.executable, '-c', runner, str(Path(__file__).resolve().parent), module, function,
+                        str(script), str(result_file), *map(json.dumps, args)],
+                       cwd=script.parent, env=env, check=True)
+        return json.loads(result_file.read_text())
+
+
+def trace_script(script, result_file):
+    """Run a script as __main__ with its output discarded and write its peak traced memory and run time."""
+    # numpy and pandas are already imported with this module, so library import overhead is not counted
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        runpy.run_path(script, run_name='__main__')
+    result = {'peak_bytes': tracemalloc.get_traced_memory()[1], 'seconds': time.perf_counter() - start}
+    Path(result_file).write_text(json.dumps(result))
+
+
+# --- Profiling ---
+def profile_script(script):
+    """Run a script in a new Python process from its own folder and return its peak traced memory and run time."""
+    return run_in_child(script, 'memory_profile', 'trace_script')
+
+
+@contextlib.contextmanager
+def script_at(script, revision):
+    """Yield the path of a temporary copy of script as of a git revision, or script itself for revision None."""
+    if revision is None:
+        yield script
+        return
+    relative = script.relative_to(Path(subprocess.check_output(['git', 'rev-parse', '--show-toplevel'], cwd=script.parent,
+                                                              text=True).strip()))
+    source = subprocess.check_output(['git', 'show', f"{revision}:{relative.as_posix()}"], cwd=script.parent, text=True)
+
+    # The copy runs from the same folder so its relative data paths and imports still resolve
+    copy = script.with_name(f".{script.stem}-{re.sub(r'[^0-9A-Za-z]', '_', revision)}.py")
+    copy.write_text(source)
+    try:
+        yield copy
+    finally:
+        copy.unlink()
+
+
+def profile_against(script, revision, current=None):
+    """Compare the peak traced allocations of the sections that differ between a git revision and current.
+
+    current is a later revision, the working tree by default. The whole-script peak would mix
+    every change between the two versions, so only sections whose code differs are compared,
+    each measured from its own start. Pin both revisions around one commit to see its effect.
+    """
+    from section_profile import split_sections
+
+    script = Path(script).resolve()
+    records, sources = {}, {}
+    for label in (revision, current):
+        with script_at(script, label) as copy:
+            sources[label] = {name: code for name, _, code in split_sections(copy.read_text(encoding='utf-8'))}
+            records[label] = {record['section']: record for record in run_in_child(copy, 'section_profile', 'run_sections', True)}
+
+    rows = []
+    for name, code in sources[current].items():
+        if sources[revision].get(name, code) == code or name not in records[revision] or name not in records[current]:
+            continue
+        old, new = records[revision][name]['alloc_peak_mb'], records[current][name]['alloc_peak_mb']
+        rows.append({
+            'script': script.name, 'section': name,
+            f'peak_mb_{revision}': round(old, 2),
+            f'peak_mb_{current or "current"}': round(new, 2),
+            'peak_saved_mb': round(old - new, 2),
+        })
+    return rows
+
+
+# --- Command Line ---
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Report the peak memory of handbook scripts")
+    parser.add_argument('scripts', nargs='+', type=Path)
+    parser.add_argument('--against', metavar='REVISION',
+                        help="compare the sections that differ from this git revision instead of whole scripts")
+    parser.add_argument('--current', metavar='REVISION', help="later revision to compare with, the working tree by default")
+    args = parser.parse_args()
+
+    if args.against:
+        rows = [row for script in args.scripts for row in profile_against(script, args.against, args.current)]
+    else:
+        rows = [{'script': script.name, **profile_script(script)} for script in args.scripts]
+    print(pd.DataFrame(rows).to_string(index=False))
@@ -0,0 +1,183 @@
+# --- Pandas Handbook: Out-of-Core Joins ---
+# Grace hash join for the merges and joins of 07_data_combining.py on inputs larger than memory, spilling to disk
+
+
+# --- Import Libraries ---
+# Import pandas for data handling, pyarrow for the spilled partitions and the streamed result, tempfile for the spill folder
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import tempfile
+from pathlib import Path
+
+
+# --- Reading Inputs in Chunks ---
+def iter_chunks(source, on, chunksize=1_000_000):
+    """Yield a DataFrame, Parquet file or CSV file in chunks of chunksize rows with the key columns as regular columns."""
+    if isinstance(source, pd.DataFrame):
+        chunks = (source.iloc[start:start + chunksize] for start in range(0, max(len(source), 1), chunksize))
+    elif Path(source).suffix == '.parquet':
+        chunks = (batch.to_pandas() for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize))
+    else:
+        chunks = pd.read_csv(source, chunksize=chunksize)
+
+    for chunk in chunks:
+        if any(name in on for name in chunk.index.names):
+            chunk = chunk.reset_index()
+        missing = [name for name in on if name not in chunk.columns]
+        if missing:
+            raise KeyError(f"Join keys {missing} not found in {type(source).__name__} input")
+        yield chunk.reset_index(drop=True)
+
+
+def key_in_index(source, on):
+    """True if the keys are the index of a DataFrame input, the result then gets them as index like pd.merge()."""
+    return isinstance(source, pd.DataFrame) and all(name in source.index.names for name in on)
+
+
+def arrow_schema(chunk, on=()):
+    """Arrow schema of a chunk without pandas metadata, columns that are all missing are stored as strings.
+
+    Key columns that are all missing are stored as float64 instead, the type numeric keys are hashed in.
+    """
+    schema = pa.Schema.from_pandas(chunk, preserve_index=False).remove_metadata()
+    for position, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            schema = schema.set(position, field.with_type(pa.float64() if field.name in on else pa.string()))
+    return schema
+
+
+# --- Partitioning ---
+def hash_keys(chunk, on):
+    """Hash the key columns of a chunk so that keys pd.merge() treats as equal get the same hash.
+
+    Numeric keys are hashed as float64 whatever their dtype in this chunk or on the other side,
+    so an int64 key 3 and a float64 key 3.0 (from a CSV chunk that read a missing value) land
+    in the same partition; adding 0.0 also turns -0.0 into 0.0. Integers above 2**53 can share
+    a float and then only share a partition, the merge inside it still compares the exact values.
+    """
+    keys = pd.DataFrame({
+        name: chunk[name].astype('float64') + 0.0
+        if pd.api.types.is_numeric_dtype(chunk[name]) and not pd.api.types.is_bool_dtype(chunk[name])
+        else chunk[name]
+        for name in on
+    })
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+def spill_partitions(source, on, folder, partitions, chunksize):
+    """Hash the keys of every chunk and append its rows to one Parquet file per partition under folder.
+
+    Returns the Arrow schema of the input. Equal keys always land in the same partition number,
+    so partition i of the left input only has to be joined with partition i of the right input.
+    """
+    folder.mkdir(parents=True)
+    writers = {}
+    schema = None
+    try:
+        for chunk in iter_chunks(source, on, chunksize):
+            schema = schema or arrow_schema(chunk, on)
+            partition = hash_keys(chunk, on) % partitions
+            for number, rows in chunk.groupby(partition, sort=False):
+                if number not in writers:
+                    writers[number] = pq.ParquetWriter(folder / f"part-{number:05d}.parquet", schema)
+                try:
+                    table = pa.Table.from_pandas(rows, schema=schema, preserve_index=False)
+                except pa.ArrowInvalid as exc:
+                    # Missing values fit an integer key column, fractions do not
+                    raise ValueError(f"a later chunk does not fit the column types of the first chunk {schema}, "
+                                     f"read the input with explicit dtypes: {exc}") from exc
+                writers[number].write_table(table)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return schema
+
+
+def read_partition(folder, number, schema):
+    path = folder / f"part-{number:05d}.parquet"
+    table = pq.read_table(path) if path.exists() else schema.empty_table()
+    return table.to_pandas()
+
+
+# --- Joining ---
+def output_schema(left_schema, right_schema, on, suffixes, how='inner'):
+    """Arrow schema of the merged rows: keys, left columns, then right columns, overlapping names get suffixes.
+
+    Arrow integer and boolean columns can hold missing values, so partitions without unmatched
+    rows and partitions with them are written with the same schema. An integer key merged with a
+    float key keeps the left type for inner and left merges and becomes float64 otherwise, the type
+    pd.merge() gives as soon as one right key has no match.
+    """
+    overlap = (set(left_schema.names) & set(right_schema.names)) - set(on)
+    fields = []
+    for field in left_schema:
+        if field.name in on:
+            other = right_schema.field(field.name).type
+            mixed = field.type != other and (pa.types.is_floating(field.type) or pa.types.is_floating(other))
+            if mixed and how in ('right', 'outer'):
+                field = field.with_type(pa.float64())
+        fields.append(field.with_name(field.name + suffixes[0]) if field.name in overlap else field)
+    for field in right_schema:
+        if field.name not in on:
+            fields.append(field.with_name(field.name + suffixes[1]) if field.name in overlap else field)
+    return pa.schema(fields)
+
+
+def merge_out_of_core(left, right, path, on, how='inner', suffixes=('_x', '_y'), partitions=64,
+                      chunksize=1_000_000, spill_dir=None):
+    """Like pd.merge(left, right, on=on, how=how), for inputs that do not fit in memory, written to Parquet at path.
+
+    left and right are DataFrames or paths to Parquet or CSV files, read in chunks of chunksize
+    rows. Both are hash-partitioned on the keys into Parquet files in a temporary folder under
+    spill_dir; then each pair of partitions is merged in memory and streamed to path, so memory
+    use is bounded by the largest partition. Rows come out partition by partition instead of in
+    pd.merge() order. Keys that are the index of both DataFrame inputs are the index of the result.
+    Returns the number of rows written.
+    """
+    if how not in ('inner', 'outer', 'left', 'right'):
+        raise ValueError(f"how must be 'inner', 'outer', 'left' or 'right', got {how!r}")
+    on = [on] if isinstance(on, str) else list(on)
+    keys_as_index = key_in_index(left, on) and key_in_index(right, on)
+
+    rows_written = 0
+    with tempfile.TemporaryDirectory(dir=spill_dir, prefix="join-spill-") as tmp_dir:
+        left_folder, right_folder = Path(tmp_dir) / "left", Path(tmp_dir) / "right"
+        left_schema = spill_partitions(left, on, left_folder, partitions, chunksize)
+        right_schema = spill_partitions(right, on, right_folder, partitions, chunksize)
+        schema = output_schema(left_schema, right_schema, on, suffixes, how)
+        if keys_as_index:
+            # from_pandas() stores index columns last and adds the pandas metadata that restores the index
+            schema = pa.schema([field for field in schema if field.name not in on] + [schema.field(name) for name in on])
+
+        tmp_path = Path(path).with_name(f".{Path(path).name}.tmp")
+        writer = None
+        try:
+            for number in range(partitions):
+                merged = pd.merge(read_partition(left_folder, number, left_schema),
+                                  read_partition(right_folder, number, right_schema),
+                                  on=on, how=how, suffixes=suffixes)
+                if keys_as_index:
+                    merged = merged.set_index(on)
+                table = pa.Table.from_pandas(merged, schema=schema, preserve_index=keys_as_index)
+                writer = writer or pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+                rows_written += len(merged)
+        finally:
+            if writer is not None:
+                writer.close()
+        tmp_path.replace(path)
+    return rows_written
+
+
+def join_out_of_core(left, right, path, on, how='left', lsuffix='', rsuffix='', **merge_kwargs):
+    """Like left.join(right, on=on, how=how) where right is indexed by on, written to Parquet at path.
+
+    The keys can be columns or index levels of either input, see merge_out_of_core() for the
+    remaining options.
+    """
+    overlap = set(right.columns if isinstance(right, pd.DataFrame) else []) & \
+              set(left.columns if isinstance(left, pd.DataFrame) else [])
+    if overlap and not (lsuffix or rsuffix):
+        raise ValueError(f"columns overlap but no suffix specified: {sorted(overlap)}")
+    return merge_out_of_core(left, right, path, on, how=how, suffixes=(lsuffix, rsuffix), **merge_kwargs)
@@ -0,0 +1,118 @@
+# --- Pandas Handbook: Parallel Multi-Format Export ---
+# Writes one DataFrame to all export formats of 02_import_export.py at the same time
+
+
+# --- Import Libraries ---
+# Import pandas for data handling, concurrent.futures for the worker pools and os/time for files and timings
+import pandas as pd
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from sqlalchemy import create_engine
+
+
+# --- Writers ---
+# Module-level functions so they can be sent to worker processes, each mirrors an export call of 02_import_export.py
+def write_csv(df, path):
+    df.to_csv(path)
+
+
+def write_tsv(df, path):
+    df.to_csv(path, sep='\t')
+
+
+def write_excel(df, path):
+    df.to_excel(path)
+
+
+def write_json(df, path):
+    df.to_json(path)
+
+
+def write_html(df, path):
+    df.to_html(path)
+
+
+def write_parquet(df, path):
+    df.to_parquet(path, engine='pyarrow', compression='snappy')
+
+
+def write_feather(df, path):
+    # Feather only stores a default index, so the index is saved as a regular column
+    df.reset_index().to_feather(path)
+
+
+def write_hdf(df, path):
+    df.to_hdf(path, key='df', mode='w', format='table', complib='blosc', complevel=9)
+
+
+# Format name: (file suffix, writer, True if the writer is CPU-bound and should run in a worker process)
+export_formats = {
+    'csv': ('.csv', write_csv, False),
+    'tsv': ('.tsv', write_tsv, False),
+    'excel': ('.xlsx', write_excel, True),
+    'json': ('.json', write_json, True),
+    'html': ('.html', write_html, True),
+    'parquet': ('.parquet', write_parquet, False),
+    'feather': ('.feather', write_feather, False),
+    'hdf': ('.h5', write_hdf, False),
+}
+
+
+# --- Atomic Writes ---
+def write_atomic(writer, df, path):
+    """Write to a temporary file next to path, then rename it, so readers never see a partial file.
+
+    Returns the seconds spent in the writer.
+    """
+    path = Path(path)
+    # Keep the real suffix at the end, some writers choose their engine by file extension
+    tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp{path.suffix}")
+    start = time.perf_counter()
+    try:
+        writer(df, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return time.perf_counter() - start
+
+
+def write_sql(df, database, table):
+    """Replace a SQL table inside one transaction, so the table is swapped atomically."""
+    engine = create_engine(database)
+    start = time.perf_counter()
+    with engine.begin() as connection:
+        df.to_sql(table, connection, if_exists='replace')
+    engine.dispose()
+    return time.perf_counter() - start
+
+
+# --- Parallel Export ---
+def export_all(df, export_dir, base_name, formats=None, database=None, sql_table=None, max_workers=None):
+    """Write df to every requested format concurrently and return the timing per format.
+
+    I/O-bound writers share a thread pool, CPU-bound writers (Excel, JSON, HTML) run in a process
+    pool. Pass database and sql_table to also replace a SQL table. Process pools re-import the
+    calling script on Windows and macOS, so call this from under if __name__ == '__main__'.
+    """
+    formats = list(export_formats) if formats is None else formats
+    export_dir = Path(export_dir)
+    export_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as threads, ProcessPoolExecutor(max_workers=max_workers) as processes:
+        futures = {}
+        for name in formats:
+            suffix, writer, cpu_bound = export_formats[name]
+            pool = processes if cpu_bound else threads
+            futures[name] = pool.submit(write_atomic, writer, df, export_dir / f"{base_name}{suffix}")
+        if database is not None:
+            futures['sql'] = threads.submit(write_sql, df, database, sql_table)
+
+        timings = {name: future.result() for name, future in futures.items()}
+    wall_s = time.perf_counter() - start
+
+    timings_df = pd.DataFrame({'seconds': timings}).sort_values('seconds', ascending=False)
+    timings_df.loc['wall clock'] = wall_s
+    return timings_df.round(3)
@@ -0,0 +1,223 @@
+# --- Pandas Handbook: Parallel Group Aggregation ---
+# Splits groupby and pivot_table aggregations of 08_data_analyzing.py across worker processes that share the columns
+
+
+# --- Import Libraries ---
+# Import pandas and numpy for data handling, shared_memory/concurrent.futures for the workers, argparse/time for the benchmark
+import pandas as pd
+import numpy as np
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+
+supported_aggregations = ('sum', 'count', 'mean', 'min', 'max', 'std', 'var', 'median', 'mode')
+
+
+# --- Shared Columns ---
+def share_array(array):
+    """Copy a NumPy array into a new shared memory block and return the block and a picklable description of it."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def read_shared(description, rows=None):
+    """Copy the rows of a shared array described by share_array() into private memory."""
+    name, shape, dtype = description
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        values = np.array(view[slice(None) if rows is None else rows])
+        del view
+    finally:
+        block.close()
+    return values
+
+
+def column_array(column):
+    """Return a column as a NumPy array for shared memory and, for non-numeric columns, its distinct values.
+
+    Numeric columns are shared as they are. Other columns are shared as their sorted factorize
+    codes (missing values as NaN), so count, min, max and mode of the codes map back to values.
+    """
+    if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_extension_array_dtype(column):
+        return column.to_numpy(), None
+    codes, uniques = pd.factorize(column, sort=True)
+    codes = np.where(codes < 0, np.nan, codes)
+    return codes, uniques
+
+
+# --- Partitioning ---
+def assign_groups(group_sizes, workers):
+    """Assign whole groups to workers, largest group first to the least loaded worker, and return the worker per group."""
+    loads = np.zeros(workers, dtype=np.int64)
+    owner = np.empty(len(group_sizes), dtype=np.int64)
+    for group in np.argsort(-group_sizes, kind='stable'):
+        worker = int(loads.argmin())
+        owner[group] = worker
+        loads[worker] += group_sizes[group]
+    return owner
+
+
+# --- Worker ---
+def group_mode(frame, column, groups):
+    """Most frequent value per group, the smallest one on ties (like Series.mode().iloc[0])."""
+    counts = frame.groupby(['group', column], sort=True).size()
+    modes = counts.groupby(level='group', sort=True).idxmax()
+    return pd.Series([key[1] for key in modes], index=modes.index).reindex(groups)
+
+
+def aggregate_partition(order_description, bounds, codes_description, column_descriptions, agg):
+    """Aggregate the groups of one partition, runs in a worker process.
+
+    The partition's rows are read in their original order from shared memory, so every group
+    sees exactly the values, in exactly the order, that df.groupby() would give it.
+    """
+    rows = np.sort(read_shared(order_description, slice(*bounds)))
+    frame = pd.DataFrame({'group': read_shared(codes_description, rows)})
+    for column, description in column_descriptions.items():
+        frame[column] = read_shared(description, rows)
+
+    grouped = frame.groupby('group', sort=True)
+    groups = grouped.size().index
+    result = {}
+    for column, functions in agg.items():
+        for function in functions:
+            if function == 'mode':
+                result[(column, function)] = group_mode(frame, column, groups)
+            else:
+                result[(column, function)] = grouped[column].agg(function)
+    return pd.DataFrame(result, index=groups)
+
+
+# --- Parallel Aggregation ---
+def parallel_agg(df, by, agg, workers=None):
+    """Like df.groupby(by).agg(agg) with agg as {column: [functions]}, split across worker processes.
+
+    Rows are partitioned by group, so each group is aggregated whole by one worker and the result
+    equals the pandas result exactly for every function, including median and mode. Columns are
+    placed in shared memory once, workers receive only the block names. At most as many workers
+    as there are groups can be busy. Call this from under if __name__ == '__main__'.
+    """
+    agg = {column: [functions] if isinstance(functions, str) else list(functions) for column, functions in agg.items()}
+    unsupported = {function for functions in agg.values() for function in functions} - set(supported_aggregations)
+    if unsupported:
+        raise ValueError(f"Unsupported aggregations {sorted(unsupported)}, use one of {supported_aggregations}")
+    workers = workers or os.cpu_count()
+
+    # Group ids in pandas' sorted group order, rows with a missing key are left out like in groupby()
+    grouped = df.groupby(by, sort=True)
+    result_index = grouped.size().index
+    codes = grouped.ngroup().to_numpy()
+    valid = ~np.isnan(codes) if codes.dtype.kind == 'f' else np.ones(len(codes), dtype=bool)
+    codes = np.where(valid, codes, -1).astype(np.int64)
+
+    group_sizes = np.bincount(codes[valid], minlength=len(result_index))
+    owner = assign_groups(group_sizes, min(workers, max(len(result_index), 1)))
+    row_owner = np.where(valid, owner[np.maximum(codes, 0)], -1)
+    order = np.argsort(row_owner, kind='stable')
+    bounds = np.searchsorted(row_owner[order], np.arange(owner.max() + 2 if len(owner) else 1))
+
+    blocks = []
+    try:
+        block, order_description = share_array(order)
+        blocks.append(block)
+        block, codes_description = share_array(codes)
+        blocks.append(block)
+        column_descriptions = {}
+        restore = {}
+        for column in agg:
+            values, uniques = column_array(df[column])
+            if uniques is not None and set(agg[column]) - {'count', 'min', 'max', 'mode'}:
+                raise TypeError(f"Column {column!r} is not numeric, only count, min, max and mode are supported")
+            block, column_descriptions[column] = share_array(values)
+            blocks.append(block)
+            restore[column] = uniques
+        del order, codes, row_owner
+
+        partitions = [(bounds[worker], bounds[worker + 1]) for worker in range(len(bounds) - 1)]
+        arguments = [(order_description, partition, codes_description, column_descriptions, agg)
+                     for partition in partitions]
+        if len(partitions) == 1:
+            parts = [aggregate_partition(*arguments[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=len(partitions)) as pool:
+                parts = list(pool.map(aggregate_partition, *zip(*arguments)))
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    result = pd.concat(parts).sort_index()
+    result.columns = pd.MultiIndex.from_tuples(result.columns)
+    result.index = result_index
+
+    # Factorized columns: min, max and mode of the codes map back to the original values
+    for column, uniques in restore.items():
+        if uniques is None:
+            continue
+        for function in set(agg[column]) & {'min', 'max', 'mode'}:
+            codes = result[(column, function)].fillna(-1).astype(np.int64)
+            result[(column, function)] = pd.Index(uniques).take(codes, allow_fill=True, fill_value=np.nan).to_numpy()
+    return result[[(column, function) for column, functions in agg.items() for function in functions]]
+
+
+def parallel_pivot_table(df, index, columns, values, aggfunc='mean', workers=None):
+    """Like pd.pivot_table(df, index=index, columns=columns, values=values, aggfunc=aggfunc) using parallel_agg()."""
+    functions = [aggfunc] if isinstance(aggfunc, str) else list(aggfunc)
+    value_columns = [values] if isinstance(values, str) else sorted(values)
+    index = [index] if isinstance(index, str) else list(index)
+    columns = [columns] if isinstance(columns, str) else list(columns)
+
+    result = parallel_agg(df, index + columns, {column: functions for column in value_columns}, workers)
+    tables = []
+    for function in functions:
+        table = result.xs(function, axis=1, level=1).unstack(columns).sort_index(axis=1)
+        tables.append(table[values] if isinstance(values, str) else table)
+    table = tables[0] if isinstance(aggfunc, str) else pd.concat(tables, axis=1, keys=functions)
+    return table.dropna(how='all', axis=1)
+
+
+# --- Benchmark ---
+def benchmark(df, rows=100_000_000, workers=None, by=('Survived', 'Pclass')):
+    """Time df.groupby(by).agg() and parallel_agg() on a synthetic frame of rows rows and check that they match."""
+    from grouped_predicates import synthetic_titanic
+
+    large_df = synthetic_titanic(df, rows)
+    agg = {'Age': ['median', 'mean', 'std', 'min', 'max'], 'Fare': ['sum', 'count', 'mode']}
+    results = []
+
+    start = time.perf_counter()
+    grouped = large_df.groupby(list(by))
+    expected = pd.concat({(column, function): grouped[column].agg(function) if function != 'mode'
+                          else grouped[column].agg(lambda x: x.mode().iloc[0])
+                          for column, functions in agg.items() for function in functions}, axis=1)
+    results.append({'method': 'groupby().agg()', 'seconds': time.perf_counter() - start})
+
+    start = time.perf_counter()
+    result = parallel_agg(large_df, list(by), agg, workers)
+    results.append({'method': f'parallel_agg(workers={workers or os.cpu_count()})',
+                    'seconds': time.perf_counter() - start})
+    if not result.equals(expected):
+        raise AssertionError("parallel_agg() differs from groupby().agg()")
+
+    report = pd.DataFrame(results)
+    report['speedup'] = report['seconds'].iloc[0] / report['seconds']
+    return report
+
+
+# --- Command Line ---
+if __name__ == '__main__':
+    from dataset_loader import load_dataset
+
+    parser = argparse.ArgumentParser(description="Benchmark parallel group aggregation against groupby().agg()")
+    parser.add_argument('--rows', type=int, default=100_000_000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--by', nargs='+', default=['Survived', 'Pclass'])
+    args = parser.parse_args()
+
+    titanic_df = load_dataset('titanic', index_col='PassengerId')
+    print(benchmark(titanic_df, args.rows, args.workers, args.by).round(3).to_string(index=False))
@@ -0,0 +1,239 @@
+# --- Pandas Handbook: Parallel JSON and HTML Readers ---
+# Split records JSON, JSON lines and HTML table files into byte ranges that worker processes parse at the same time
+
+
+# --- Import Libraries ---
+# Import pandas and numpy for data handling, lxml for HTML rows, concurrent.futures for the workers
+import pandas as pd
+import numpy as np
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from lxml import etree, html
+from pandas.io.parsers import TextParser
+
+
+# --- Record Boundaries ---
+def iter_json_record_ends(path, block_size=1 << 23):
+    """Yield, block by block, the byte offsets just after every top-level record of a JSON array such as [{...}, {...}].
+
+    The file is scanned with NumPy on the positions of quotes, backslashes and brackets only:
+    quotes not escaped by an odd number of backslashes toggle "inside a string", and brackets
+    outside strings change the nesting depth. A '}' that returns to depth 1 closes a record.
+    Memory use depends on block_size, not on the file size.
+    """
+    depth, in_string, backslashes, offset = 0, 0, 0, 0
+    with open(path, 'rb') as file:
+        while block := file.read(block_size):
+            chars = np.frombuffer(block, dtype=np.uint8)
+            quotes = np.flatnonzero(chars == ord('"'))
+
+            # A quote is escaped when the run of backslashes right before it has odd length
+            slashes = np.flatnonzero(chars == ord('\\'))
+            if len(slashes) or backslashes:
+                run_starts = np.flatnonzero(np.diff(slashes, prepend=-2) != 1)
+                run_ends = np.append(slashes[run_starts[1:] - 1], slashes[-1]) if len(slashes) else slashes
+                run_lengths = run_ends - slashes[run_starts] + 1 if len(slashes) else slashes
+                if backslashes and len(slashes) and slashes[0] == 0:
+                    run_lengths[0] += backslashes
+                if backslashes and (not len(slashes) or slashes[0] != 0):
+                    run_ends, run_lengths = np.append(-1, run_ends), np.append(backslashes, run_lengths)
+                found = np.searchsorted(run_ends, quotes - 1)
+                hit = found < len(run_ends)
+                hit[hit] = run_ends[found[hit]] == quotes[hit] - 1
+                escaped = np.zeros(len(quotes), dtype=bool)
+                escaped[hit] = run_lengths[found[hit]] % 2 == 1
+                quotes = quotes[~escaped]
+                trailing = len(run_ends) and run_ends[-1] == len(chars) - 1
+                backslashes = int(run_lengths[-1]) if trailing else 0
+
+            # Brackets are structural when an even number of quotes (plus the carried state) precede them
+            brackets = np.flatnonzero((chars == ord('{')) | (chars == ord('}')) | (chars == ord('[')) | (chars == ord(']')))
+            outside = (np.searchsorted(quotes, brackets) + in_string) % 2 == 0
+            brackets = brackets[outside]
+            is_close = (chars[brackets] == ord('}')) | (chars[brackets] == ord(']'))
+            levels = depth + np.cumsum(np.where(is_close, -1, 1))
+
+            yield offset + brackets[is_close & (chars[brackets] == ord('}')) & (levels == 1)] + 1
+            depth = int(levels[-1]) if len(levels) else depth
+            in_string = (len(quotes) + in_string) % 2
+            offset += len(chars)
+
+
+# --- Byte Ranges ---
+# Each function splits a file into (start, end) byte ranges of about range_bytes that start at a record boundary
+def record_ranges(path, range_bytes):
+    """Byte ranges of a records JSON array, every range holds whole records."""
+    ranges, start = [], 0
+    for ends in iter_json_record_ends(path):
+        for end in ends[ends >= start + range_bytes]:
+            if end >= start + range_bytes:
+                ranges.append((start, int(end)))
+                start = int(end)
+    return ranges + [(start, os.path.getsize(path))]
+
+
+def line_ranges(path, range_bytes):
+    """Byte ranges of a JSON lines file, every range holds whole lines."""
+    size = os.path.getsize(path)
+    ranges, start = [], 0
+    with open(path, 'rb') as file:
+        while start + range_bytes < size:
+            file.seek(start + range_bytes)
+            file.readline()
+            ranges.append((start, file.tell()))
+            start = file.tell()
+    return ranges + [(start, size)] if start < size else ranges
+
+
+row_start = re.compile(rb'<tr[\s>]', re.IGNORECASE)
+
+
+def html_ranges(path, range_bytes, body_start):
+    """Byte ranges of the table rows after body_start, every range starts at a <tr> tag."""
+    size = os.path.getsize(path)
+    ranges, start = [], body_start
+    with open(path, 'rb') as file:
+        while start + range_bytes < size:
+            file.seek(start + range_bytes)
+            position, data = file.tell(), b''
+            while (match := row_start.search(data)) is None and (piece := file.read(1 << 16)):
+                data += piece
+            if match is None:
+                break
+            ranges.append((start, position + match.start()))
+            start = position + match.start()
+    return ranges + [(start, size)]
+
+
+def read_range(path, start, end):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        return file.read(end - start)
+
+
+# --- Parsing Ranges ---
+# Module-level functions so they can be sent to worker processes
+def parse_json_range(path, start, end, lines):
+    """Parse the records in one byte range, values keep their JSON types like read_json(dtype=False)."""
+    text = read_range(path, start, end).decode('utf-8')
+    if not lines:
+        # Drop the array brackets and the separating comma around the records of this range
+        text = '[' + text.strip().lstrip('[').lstrip().lstrip(',').rstrip().rstrip(']') + ']'
+    if not text.strip(' \t\r\n[]'):
+        return pd.DataFrame()
+    return pd.read_json(io.StringIO(text), orient='records', lines=lines, dtype=False, convert_dates=False)
+
+
+def cell_text(cell):
+    # Same whitespace clean-up as pd.read_html()
+    return re.sub(r'[\r\n]+|\s{2,}', ' ', ''.join(cell.itertext()).strip())
+
+
+def parse_html_range(path, start, end):
+    """Return the cell texts of the <tr> rows in one byte range."""
+    table = html.fromstring(b'<table>' + read_range(path, start, end) + b'</table>')
+    return [[cell_text(cell) for cell in row if cell.tag in ('td', 'th')] for row in table.iter('tr')]
+
+
+def rows_to_frame(header, rows):
+    """Build a DataFrame from cell texts with the type inference pd.read_html() uses."""
+    with TextParser([header] + rows, header=0, thousands=',') as parser:
+        return parser.read()
+
+
+def html_header(path):
+    """Return the column names from the <thead> of an HTML table file and the offset of its <tbody>."""
+    with open(path, 'rb') as file:
+        data = b''
+        while b'<tbody' not in data.lower() and (piece := file.read(1 << 16)):
+            data += piece
+    body_start = data.lower().find(b'<tbody')
+    if body_start < 0:
+        raise ValueError(f"{path} has no <tbody>, write it with DataFrame.to_html() or read it with pd.read_html()")
+    head = html.fromstring(data[:body_start] + b'</table>')
+    header_row = next(head.iter('tr'))
+    return [cell_text(cell) for cell in header_row if cell.tag in ('td', 'th')], body_start
+
+
+# --- Parallel Readers ---
+def json_lines_mode(path, lines):
+    if lines is not None:
+        return lines
+    if str(path).endswith(('.jsonl', '.ndjson')):
+        return True
+    with open(path, 'rb') as file:
+        if file.read(1 << 10).lstrip()[:1] != b'[':
+            raise ValueError(f"{path} is neither JSON lines nor a records array, "
+                             f"only files written with orient='records' (optionally lines=True) can be split")
+    return False
+
+
+def read_json_parallel(path, lines=None, workers=None, range_bytes=None, dtype=None):
+    """Like pd.read_json(path, orient='records', lines=lines, dtype=False), parsed by worker processes.
+
+    The file is split into byte ranges at record boundaries (newlines for JSON lines, the end of
+    each top-level object for records arrays) and every worker parses whole ranges. Values keep
+    their JSON types, pass dtype={column: type} to convert columns afterwards. Call this from
+    under if __name__ == '__main__', process pools re-import the calling script.
+    """
+    lines = json_lines_mode(path, lines)
+    workers = workers or os.cpu_count()
+    range_bytes = range_bytes or max(os.path.getsize(path) // (4 * workers), 1 << 20)
+    ranges = line_ranges(path, range_bytes) if lines else record_ranges(path, range_bytes)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(parse_json_range, *zip(*[(path, start, end, lines) for start, end in ranges])))
+    df = pd.concat([part for part in parts if len(part.columns)], ignore_index=True)
+    return df if dtype is None else df.astype(dtype)
+
+
+def read_html_parallel(path, workers=None, range_bytes=None):
+    """Like pd.read_html(path)[0] for a file holding one table with a <thead>, as written by DataFrame.to_html().
+
+    Worker processes parse byte ranges of <tr> rows with lxml, the parent converts the cell texts
+    with the same type inference as pd.read_html(). colspan and rowspan are not expanded.
+    """
+    header, body_start = html_header(path)
+    workers = workers or os.cpu_count()
+    range_bytes = range_bytes or max((os.path.getsize(path) - body_start) // (4 * workers), 1 << 20)
+    ranges = html_ranges(path, range_bytes, body_start)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(parse_html_range, *zip(*[(path, start, end) for start, end in ranges])))
+    return rows_to_frame(header, [row for part in parts for row in part])
+
+
+# --- Incremental Readers ---
+def iter_json(path, lines=None, chunk_bytes=16 << 20, dtype=None):
+    """Yield DataFrames of about chunk_bytes of records each, memory use is bounded by the chunk size."""
+    lines = json_lines_mode(path, lines)
+    ranges = line_ranges(path, chunk_bytes) if lines else record_ranges(path, chunk_bytes)
+    for start, end in ranges:
+        chunk = parse_json_range(path, start, end, lines)
+        if len(chunk.columns):
+            yield chunk if dtype is None else chunk.astype(dtype)
+
+
+def iter_html(path, chunksize=100_000):
+    """Yield DataFrames of chunksize table rows, parsing the file with lxml iterparse and freeing every parsed row.
+
+    Each chunk infers its column types on its own, like pd.read_csv(chunksize=...).
+    """
+    header, rows = None, []
+    for _, row in etree.iterparse(str(path), events=('end',), tag='tr', html=True):
+        cells = [cell_text(cell) for cell in row if cell.tag in ('td', 'th')]
+        if header is None:
+            header = cells
+        else:
+            rows.append(cells)
+        # Drop the parsed row and its finished siblings so the tree never grows
+        row.clear()
+        while row.getprevious() is not None:
+            del row.getparent()[0]
+        if len(rows) == chunksize:
+            yield rows_to_frame(header, rows)
+            rows = []
+    if rows:
+        yield rows_to_frame(header, rows)
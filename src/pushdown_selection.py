@@ -0,0 +1,152 @@
+# --- Pandas Handbook: Predicate & Column Pushdown ---
+# Runs the selections of 04_data_selection.py as Parquet dataset scans that read only matching rows and columns
+
+
+# --- Import Libraries ---
+# Import pyarrow for dataset scans and ast/re to translate query strings
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import ast
+import json
+import re
+import shutil
+from pathlib import Path
+
+
+# --- Writing a Partitioned Dataset ---
+def write_partitioned_dataset(df, path, partition_by=('Country',), sort_by=('Brand',), rows_per_group=64_000,
+                              source_digest=None):
+    """Write df as a hive-partitioned Parquet dataset (one directory per partition value), replacing any old one.
+
+    Sorting inside each partition keeps the min/max statistics of every row group narrow, so
+    filters on the sort columns can skip whole row groups without reading them. source_digest
+    (see dataset_loader.source_digest()) is stored in _source.json, dataset_is_current() compares it.
+    """
+    # Remove the old dataset, partitions of values that no longer exist would otherwise stay behind
+    shutil.rmtree(path, ignore_errors=True)
+    frame = df.reset_index() if any(name is not None for name in df.index.names) else df
+    frame = frame.sort_values(list(partition_by) + list(sort_by), kind='stable')
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    ds.write_dataset(
+        table, path, format='parquet', partitioning=list(partition_by), partitioning_flavor='hive',
+        max_rows_per_group=rows_per_group, min_rows_per_group=min(rows_per_group, 1024),
+        existing_data_behavior='delete_matching',
+    )
+    # Files starting with '_' are not part of the dataset when it is scanned
+    (Path(path) / "_source.json").write_text(json.dumps({'source_digest': source_digest}))
+
+
+def dataset_is_current(path, source_digest):
+    """True if a dataset was written by write_partitioned_dataset() from the source with this digest."""
+    source_file = Path(path) / "_source.json"
+    return source_file.exists() and json.loads(source_file.read_text())['source_digest'] == source_digest
+
+
+# --- Translating Filters ---
+comparisons = {
+    ast.Eq: lambda field, value: field == value,
+    ast.NotEq: lambda field, value: field != value,
+    ast.Lt: lambda field, value: field < value,
+    ast.LtE: lambda field, value: field <= value,
+    ast.Gt: lambda field, value: field > value,
+    ast.GtE: lambda field, value: field >= value,
+    ast.In: lambda field, value: field.isin(value),
+    ast.NotIn: lambda field, value: ~field.isin(value),
+}
+
+# The comparison with the field on the other side, for queries written as "4 < Stars"
+mirrored = {ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Gt: ast.Lt, ast.GtE: ast.LtE, ast.Eq: ast.Eq, ast.NotEq: ast.NotEq}
+
+
+def query_to_expression(query):
+    """Translate a DataFrame.query() style string into a pyarrow filter expression.
+
+    Supports comparisons with the column on either side (also chained, "3 <= Stars < 4"),
+    'in' / 'not in' lists, 'and', 'or', 'not' and backtick quoted column names, for example
+    "Country == 'Japan' and Stars >= 4.5" or "`Top Ten` != '2016 #1'". Missing values compare
+    like in pandas: False for every comparison except != and 'not in', which are True, so
+    'not' selects them as DataFrame.query() does instead of Arrow dropping them as null.
+    """
+    names = {}
+
+    def replace_backticks(match):
+        placeholder = f"__column_{len(names)}"
+        names[placeholder] = match.group(1)
+        return placeholder
+
+    tree = ast.parse(re.sub(r'`([^`]+)`', replace_backticks, query), mode='eval')
+
+    def convert(node):
+        if isinstance(node, ast.BoolOp):
+            parts = [convert(value) for value in node.values]
+            expression = parts[0]
+            for part in parts[1:]:
+                expression = expression & part if isinstance(node.op, ast.And) else expression | part
+            return expression
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return ~convert(node.operand)
+        if isinstance(node, ast.Compare):
+            # "a < b < c" is "a < b and b < c"
+            operands = [node.left] + node.comparators
+            expression = None
+            for left, op, right in zip(operands, node.ops, operands[1:]):
+                term = compare(left, type(op), right, node)
+                expression = term if expression is None else expression & term
+            return expression
+        raise ValueError(f"Unsupported query syntax: {ast.unparse(node)}")
+
+    def compare(left, op, right, node):
+        if not isinstance(left, ast.Name) and isinstance(right, ast.Name) and op in mirrored:
+            left, op, right = right, mirrored[op], left
+        if not isinstance(left, ast.Name) or isinstance(right, ast.Name):
+            raise ValueError(f"Unsupported query syntax: {ast.unparse(node)}")
+        field = ds.field(names.get(left.id, left.id))
+        return pc.coalesce(comparisons[op](field, ast.literal_eval(right)), op in (ast.NotEq, ast.NotIn))
+
+    return convert(tree.body)
+
+
+def filters_to_expression(filters):
+    """Translate pandas read_parquet style filters, [(column, op, value), ...] or a list of such lists (OR)."""
+    operators = {'==': ast.Eq, '=': ast.Eq, '!=': ast.NotEq, '<': ast.Lt, '<=': ast.LtE,
+                 '>': ast.Gt, '>=': ast.GtE, 'in': ast.In, 'not in': ast.NotIn}
+    groups = filters if isinstance(filters[0], list) else [filters]
+
+    expression = None
+    for group in groups:
+        conjunction = None
+        for column, op, value in group:
+            term = comparisons[operators[op]](ds.field(column), value)
+            conjunction = term if conjunction is None else conjunction & term
+        expression = conjunction if expression is None else expression | conjunction
+    return expression
+
+
+# --- Selecting ---
+def select(path, columns=None, query=None, filters=None, index_col='Review #'):
+    """Scan a Parquet dataset and materialize only the matching rows and the requested columns.
+
+    Pass either query (a DataFrame.query() style string) or filters (read_parquet style tuples).
+    Partition directories that cannot match are never opened and row groups whose statistics
+    exclude the filter are skipped.
+    """
+    dataset = ds.dataset(path, format='parquet', partitioning='hive')
+
+    expression = None
+    if query is not None:
+        expression = query_to_expression(query)
+    elif filters is not None:
+        expression = filters_to_expression(filters)
+
+    # The index column is always read so the result can be indexed like the original DataFrame
+    scan_columns = None
+    if columns is not None:
+        scan_columns = list(columns)
+        if index_col is not None and index_col not in scan_columns:
+            scan_columns.insert(0, index_col)
+
+    df = dataset.to_table(columns=scan_columns, filter=expression).to_pandas()
+    if index_col is not None and index_col in df.columns:
+        df = df.set_index(index_col)
+    return df
@@ -0,0 +1,211 @@
+# --- Pandas Handbook: Section Profile ---
+# Runs handbook scripts section by section and records time, peak RSS and allocations of every '# --- Section ---' block
+
+
+# --- Import Libraries ---
+# Import pandas for the reports, the shared RSS sampler for the resident memory, tracemalloc for allocations,
+# the child process runner of memory_profile to run every script in a fresh process and json to store the records
+import pandas as pd
+import argparse
+import ast
+import contextlib
+import datetime
+import json
+import os
+import platform
+import re
+import sys
+import time
+import tracemalloc
+import types
+import numpy as np
+from pathlib import Path
+from dataset_loader import data_dir
+from measurement import RssSampler
+from memory_profile import run_in_child
+
+
+section_header = re.compile(r'^# --- (.+) ---\s*$')
+default_output = data_dir / "benchmarks" / "section-profile.jsonl"
+
+
+# --- Splitting Scripts ---
+def split_sections(source):
+    """Return (name, first line, code) for every '# --- Section ---' block of a script that contains statements.
+
+    The title header and sections holding only comments or a docstring (the footer) are left out.
+    """
+    lines = source.splitlines(keepends=True)
+    starts = [(number, match.group(1)) for number, line in enumerate(lines) if (match := section_header.match(line))]
+    if not starts or starts[0][0] != 0:
+        starts.insert(0, (0, 'Header'))
+
+    sections = []
+    for (start, name), (end, _) in zip(starts, starts[1:] + [(len(lines), None)]):
+        code = ''.join(lines[start:end])
+        body = ast.parse(code).body
+        if all(isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) for node in body):
+            continue
+        sections.append((name, start + 1, code))
+    return sections
+
+
+# --- Measuring ---
+def run_sections(script, result_file, trace_allocations=True):
+    """Execute a script's sections one after another in a single __main__ module and write one record per section.
+
+    Runs in the child process started by profile_sections(). The sections share their globals
+    like in a normal run; the first section that raises ends the run and is recorded with its
+    error. The script's own output is discarded.
+    """
+    import pyarrow
+
+    script = Path(script).resolve()
+    module = types.ModuleType('__main__')
+    module.__file__ = str(script)
+    # Process pools pickle functions of the script by reference to __main__, so the script has to be __main__
+    main_module, sys.modules['__main__'] = sys.modules['__main__'], module
+    sys.path.insert(0, str(script.parent))
+
+    environment = {'python': platform.python_version(), 'pandas': pd.__version__, 'numpy': np.__version__,
+                   'pyarrow': pyarrow.__version__}
+    records = []
+    if trace_allocations:
+        tracemalloc.start()
+    try:
+        with RssSampler() as sampler, open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for order, (name, first_line, code) in enumerate(split_sections(script.read_text(encoding='utf-8'))):
+                # Leading blank lines keep the line numbers of tracebacks those of the script
+                compiled = compile('\n' * (first_line - 1) + code, str(script), 'exec')
+                rss_start = sampler.reset()
+                if trace_allocations:
+                    tracemalloc.reset_peak()
+                traced_start = tracemalloc.get_traced_memory()[0]
+                start, cpu_start = time.perf_counter(), time.process_time()
+                error = None
+                try:
+                    exec(compiled, module.__dict__)
+                except Exception as exc:
+                    error = f"{type(exc).__name__}: {exc}"
+                seconds, cpu_seconds = time.perf_counter() - start, time.process_time() - cpu_start
+                traced_end, traced_peak = tracemalloc.get_traced_memory()
+
+                rss_end = sampler.rss()
+                records.append({
+                    'script': script.name, 'section': name, 'order': order, 'line': first_line,
+                    'seconds': seconds, 'cpu_seconds': cpu_seconds,
+                    'rss_start_mb': rss_start / 1024 ** 2, 'rss_end_mb': rss_end / 1024 ** 2,
+                    'peak_rss_mb': max(sampler.peak, rss_end) / 1024 ** 2,
+                    'alloc_peak_mb': (traced_peak - traced_start) / 1024 ** 2 if trace_allocations else None,
+                    'alloc_net_mb': (traced_end - traced_start) / 1024 ** 2 if trace_allocations else None,
+                    'traced': trace_allocations, 'error': error, **environment,
+                })
+                if error is not None:
+                    break
+    finally:
+        tracemalloc.stop()
+        sys.modules['__main__'] = main_module
+
+    Path(result_file).write_text(json.dumps(records))
+
+
+# --- Profiling ---
+def profile_sections(script, trace_allocations=True, run_id=None):
+    """Run a script in a new Python process from its own folder and return one record per section.
+
+    Tracing allocations slows pure Python code down, so compare timings only between runs with
+    the same trace_allocations setting (stored in every record as 'traced').
+    """
+    run_id = run_id or datetime.datetime.now().isoformat(timespec='seconds')
+    records = run_in_child(script, 'section_profile', 'run_sections', trace_allocations)
+    return [{'run': run_id, **record} for record in records]
+
+
+def append_records(records, path=default_output):
+    """Append the section records to a JSON lines file, one JSON object per section."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as file:
+        for record in records:
+            file.write(json.dumps(record) + '\n')
+
+
+def read_records(path=default_output):
+    return pd.read_json(path, lines=True)
+
+
+# --- Reports ---
+def folded_stacks(records, metric='seconds'):
+    """Return 'script;section value' lines, the folded stack format read by flamegraph.pl and speedscope.
+
+    Values are milliseconds for 'seconds' and 'cpu_seconds' and kilobytes for the '_mb' metrics,
+    since the format only takes whole numbers.
+    """
+    scale = 1000 if metric.endswith('seconds') else 1024
+    lines = []
+    for record in records:
+        value = round((record[metric] or 0) * scale)
+        if value > 0:
+            lines.append(f"{record['script']};{record['section']} {value}")
+    return '\n'.join(lines)
+
+
+def summary(records, top=20, width=40):
+    """Return a text summary of the slowest sections with their share of the total run time as a bar."""
+    df = pd.DataFrame(records)
+    total = df['seconds'].sum()
+    df['share'] = df['seconds'] / total
+    lines = [f"{'script;section':<60} {'seconds':>9} {'peak_rss_mb':>12}  share of {total:.1f}s"]
+    for _, row in df.sort_values('seconds', ascending=False).head(top).iterrows():
+        label = f"{row['script']};{row['section']}"[:60]
+        bar = '#' * max(round(row['share'] * width), 1)
+        lines.append(f"{label:<60} {row['seconds']:>9.3f} {row['peak_rss_mb']:>12.1f}  {bar} {row['share']:.1%}")
+
+    # One line per script, the same view a flame graph gives at its first level
+    lines.append('')
+    for script, seconds in df.groupby('script', sort=False)['seconds'].sum().items():
+        bar = '#' * max(round(seconds / total * width), 1)
+        lines.append(f"{script:<60} {seconds:>9.3f} {'':>12}  {bar} {seconds / total:.1%}")
+    return '\n'.join(lines)
+
+
+def compare_runs(records, baseline, current, metrics=('seconds', 'peak_rss_mb', 'alloc_peak_mb')):
+    """Compare two runs section by section, a ratio above 1 means the current run is slower or uses more memory."""
+    df = pd.DataFrame(records)
+    pivot = df[df['run'].isin([baseline, current])].pivot_table(index=['script', 'section'], columns='run',
+                                                                values=list(metrics), sort=False)
+    rows = {}
+    for metric in metrics:
+        # Metrics missing from one run (allocations of an untraced run) are left out
+        if (metric, baseline) in pivot and (metric, current) in pivot:
+            rows[(metric, 'baseline')] = pivot[(metric, baseline)]
+            rows[(metric, 'current')] = pivot[(metric, current)]
+            rows[(metric, 'ratio')] = pivot[(metric, current)] / pivot[(metric, baseline)]
+    return pd.DataFrame(rows)
+
+
+# --- Command Line ---
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Profile the sections of handbook scripts")
+    parser.add_argument('scripts', nargs='*', type=Path,
+                        help="scripts to run, all numbered chapter scripts in this folder by default")
+    parser.add_argument('--no-allocations', action='store_true', help="skip tracemalloc, timings are closer to normal")
+    parser.add_argument('--output', type=Path, default=default_output, help="JSON lines file the records are appended to")
+    parser.add_argument('--run-id', default=None, help="label of this run, the start time by default")
+    parser.add_argument('--compare', metavar='RUN', help="compare this run with an earlier run stored in --output")
+    args = parser.parse_args()
+
+    scripts = args.scripts or sorted(Path(__file__).resolve().parent.glob('[0-9][0-9]_*.py'))
+    run_id = args.run_id or datetime.datetime.now().isoformat(timespec='seconds')
+    records = []
+    for script in scripts:
+        print(f"Profiling {script.name}")
+        records.extend(profile_sections(script, trace_allocations=not args.no_allocations, run_id=run_id))
+
+    append_records(records, args.output)
+    args.output.with_suffix('.folded').write_text(folded_stacks(records) + '\n')
+    print(summary(records))
+    print(f"Records appended to {args.output}, folded stacks for flamegraph.pl in {args.output.with_suffix('.folded')}")
+
+    if args.compare:
+        print(compare_runs(read_records(args.output), args.compare, run_id).round(3).to_string())
@@ -0,0 +1,92 @@
+# --- Pandas Handbook: Bulk SQL Input & Output ---
+# Chunked SQL reads and batched, single-transaction writes with upsert support over pooled SQLAlchemy engines
+
+
+# --- Import Libraries ---
+# Import pandas for data handling and SQLAlchemy for engines and connection pooling
+import pandas as pd
+from functools import lru_cache
+from sqlalchemy import create_engine, inspect
+
+
+# --- Pooled Engines ---
+@lru_cache(maxsize=None)
+def get_engine(database):
+    """Return one shared engine per database URL, so its connection pool is reused across calls."""
+    return create_engine(database)
+
+
+# --- Chunked Reads ---
+def read_sql_chunks(sql, database, chunksize=100_000, **read_kwargs):
+    """Yield DataFrame chunks of a table or query, streaming rows from the database cursor.
+
+    stream_results asks the driver for a server-side cursor where it has one, so rows are fetched
+    per chunk instead of all at once.
+    """
+    engine = get_engine(database)
+    with engine.connect().execution_options(stream_results=True) as connection:
+        yield from pd.read_sql(sql, connection, chunksize=chunksize, **read_kwargs)
+
+
+# --- Batched Writes ---
+def placeholders(paramstyle, count):
+    """Return the positional parameter markers of the driver, for example '?, ?, ?' for SQLite."""
+    if paramstyle == 'qmark':
+        return ', '.join(['?'] * count)
+    if paramstyle in ('format', 'pyformat'):
+        return ', '.join(['%s'] * count)
+    if paramstyle == 'numeric':
+        return ', '.join(f':{i + 1}' for i in range(count))
+    raise ValueError(f"Unsupported DBAPI paramstyle {paramstyle!r}")
+
+
+def column_values(values):
+    """Return a column as a list of Python objects, missing values become None (SQL NULL)."""
+    if values.hasnans:
+        values = values.astype(object).where(values.notna(), None)
+    return values.tolist()
+
+
+def batch_rows(df, batch_size):
+    """Yield lists of row tuples with batch_size rows each."""
+    for start in range(0, len(df), batch_size):
+        batch = df.iloc[start:start + batch_size]
+        yield list(zip(*(column_values(batch[column]) for column in batch.columns)))
+
+
+def bulk_write(df, table, database, if_exists='append', key=None, batch_size=50_000):
+    """Write df to a SQL table with executemany batches inside one transaction.
+
+    if_exists is 'append', 'replace' or 'upsert'. With 'upsert', rows whose key already exists are
+    updated and new rows are inserted (INSERT ... ON CONFLICT, SQLite 3.24+ and PostgreSQL).
+    A named index is written as a column like df.to_sql() does. Returns the number of rows written.
+    """
+    if if_exists not in ('append', 'replace', 'upsert'):
+        raise ValueError(f"if_exists must be 'append', 'replace' or 'upsert', got {if_exists!r}")
+    if if_exists == 'upsert' and key is None:
+        raise ValueError("Upserts need the key column, for example key='Review #'")
+
+    engine = get_engine(database)
+    frame = df.reset_index() if any(name is not None for name in df.index.names) else df
+    quote = engine.dialect.identifier_preparer.quote
+    columns = ', '.join(quote(column) for column in frame.columns)
+    sql = f"INSERT INTO {quote(table)} ({columns}) VALUES ({placeholders(engine.dialect.paramstyle, len(frame.columns))})"
+
+    if if_exists == 'upsert':
+        updates = ', '.join(f"{quote(column)} = excluded.{quote(column)}" for column in frame.columns if column != key)
+        sql += f" ON CONFLICT ({quote(key)}) DO UPDATE SET {updates}"
+
+    with engine.begin() as connection:
+        # Let pandas create the table schema from an empty frame, then insert the rows in batches
+        table_exists = inspect(connection).has_table(table)
+        if if_exists == 'replace' or not table_exists:
+            frame.head(0).to_sql(table, connection, if_exists='replace', index=False)
+        if if_exists == 'upsert':
+            connection.exec_driver_sql(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {quote(f'ux_{table}_{key}')} ON {quote(table)} ({quote(key)})"
+            )
+
+        for rows in batch_rows(frame, batch_size):
+            connection.exec_driver_sql(sql, rows)
+
+    return len(frame)
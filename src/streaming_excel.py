@@ -0,0 +1,174 @@
+# --- Pandas Handbook: Streaming Excel Reader & Writer ---
+# Reads .xlsx sheets row by row in DataFrame chunks and writes them in openpyxl's write-only mode, so memory stays bounded
+
+
+# --- Import Libraries ---
+# Import pandas for data handling, openpyxl for row-level access to the workbook and argparse for the benchmark
+import pandas as pd
+import argparse
+import math
+import os
+from pathlib import Path
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell.cell import ERROR_CODES
+from pandas.io.parsers import TextParser
+
+
+# Rows per sheet in .xlsx files, including the header row
+max_sheet_rows = 1_048_576
+
+
+# --- Reading ---
+def convert_value(value):
+    """Convert a cell value the way pd.read_excel() does: empty cells to '', errors to NaN, whole floats to int."""
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, str) and value in ERROR_CODES:
+        return math.nan
+    return value
+
+
+def rows_to_frame(header, rows, index_col, start):
+    """Build a DataFrame from cell values with the type inference pd.read_excel() uses.
+
+    Without index_col the chunk gets a RangeIndex from start, the number of rows before it.
+    """
+    width = len(header)
+    rows = [row[:width] + [''] * (width - len(row)) for row in rows]
+    with TextParser([header] + rows, header=0) as parser:
+        chunk = parser.read()
+    if index_col is None:
+        return chunk.set_axis(pd.RangeIndex(start, start + len(chunk)))
+    return chunk.set_index(index_col)
+
+
+def index_labels(header, index_col):
+    """Translate the column positions of index_col (an int or a list, as in pd.read_excel()) into header labels."""
+    if index_col is None:
+        return None
+    labels = [header[column] if isinstance(column, int) else column
+              for column in (index_col if isinstance(index_col, list) else [index_col])]
+    return labels if isinstance(index_col, list) else labels[0]
+
+
+def iter_excel(path, sheet_name=0, chunksize=100_000, index_col=None):
+    """Yield a sheet as DataFrames of chunksize rows each, like pd.read_csv(chunksize=...) for .xlsx files.
+
+    The workbook is opened read-only, so openpyxl parses the sheet XML as it is iterated and
+    only one chunk of rows is held in memory. The first row is the header. index_col takes column
+    positions like pd.read_excel() or header labels; without it the index continues across
+    chunks. Each chunk infers its column types on its own; pass the chunks through astype() if a
+    column must have one type.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+        # The stored dimensions can be wrong, read until the last row instead
+        sheet.reset_dimensions()
+
+        header, rows, start = None, [], 0
+        for values in sheet.iter_rows(values_only=True):
+            row = [convert_value(value) for value in values]
+            while row and row[-1] == '':
+                row.pop()
+            if header is None:
+                header = row
+                labels = index_labels(header, index_col)
+            elif row:
+                rows.append(row)
+            if len(rows) == chunksize:
+                yield rows_to_frame(header, rows, labels, start)
+                start += len(rows)
+                rows = []
+        if rows:
+            yield rows_to_frame(header, rows, labels, start)
+    finally:
+        workbook.close()
+
+
+# --- Writing ---
+def iter_frames(data, chunksize):
+    if isinstance(data, pd.DataFrame):
+        return (data.iloc[start:start + chunksize] for start in range(0, max(len(data), 1), chunksize))
+    return iter(data)
+
+
+def write_excel_streaming(data, path, sheet_name='Sheet1', index=True, chunksize=100_000):
+    """Write a DataFrame, or an iterable of DataFrame chunks, to one sheet of an .xlsx file at path.
+
+    openpyxl's write-only mode streams every appended row to a temporary file, so memory does
+    not grow with the sheet, and chunks from iter_excel() or pd.read_csv(chunksize=...) can be
+    converted without loading the whole table. Values match df.to_excel(path, index=index)
+    without its header styling. Raises ValueError before a sheet would pass the Excel row limit.
+    Returns the number of data rows written.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp{path.suffix}")
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    rows_written = 0
+    header = None
+
+    for chunk in iter_frames(data, chunksize):
+        if header is None:
+            header = ([name for name in chunk.index.names] if index else []) + list(chunk.columns)
+            sheet.append(header)
+        if rows_written + len(chunk) + 1 > max_sheet_rows:
+            raise ValueError(f"{rows_written + len(chunk)} rows do not fit on one sheet, "
+                             f"the .xlsx limit is {max_sheet_rows - 1} rows plus the header")
+        if index:
+            chunk = chunk.reset_index()
+        # Missing values become empty cells like to_excel(), NumPy scalars become Python values
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(row)
+        rows_written += len(chunk)
+
+    workbook.save(tmp_path)
+    os.replace(tmp_path, path)
+    return rows_written
+
+
+# --- Benchmark ---
+def benchmark(df, rows=1_000_000, chunksize=100_000, work_dir=None):
+    """Time and measure the peak memory of to_excel()/read_excel() against the streaming functions on rows rows."""
+    import tempfile
+    from format_benchmark import scale_dataset
+    from measurement import measure
+
+    large_df = scale_dataset(df, math.ceil(rows / len(df))).iloc[:rows]
+    results = []
+
+    def read_streaming(path):
+        return sum(len(chunk) for chunk in iter_excel(path, chunksize=chunksize, index_col=large_df.index.name))
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        path = Path(tmp_dir) / "ramen-ratings.xlsx"
+        for method, writer, reader in [
+            ('to_excel / read_excel', lambda: large_df.to_excel(path),
+             lambda: len(pd.read_excel(path, index_col=large_df.index.name))),
+            ('streaming', lambda: write_excel_streaming(large_df, path, chunksize=chunksize),
+             lambda: read_streaming(path)),
+        ]:
+            _, write_s, write_peak, _ = measure(writer)
+            rows_read, read_s, read_peak, _ = measure(reader)
+            results.append({'method': method, 'rows': rows_read, 'write_s': write_s, 'read_s': read_s,
+                            'write_peak_mb': write_peak / 1024 ** 2, 'read_peak_mb': read_peak / 1024 ** 2})
+            path.unlink()
+
+    return pd.DataFrame(results)
+
+
+# --- Command Line ---
+if __name__ == '__main__':
+    from dataset_loader import load_dataset
+
+    parser = argparse.ArgumentParser(description="Benchmark streaming .xlsx reading and writing against pandas")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    args = parser.parse_args()
+
+    ramen_df = load_dataset('ramen', index_col='Review #')
+    print(benchmark(ramen_df, args.rows, args.chunksize).round(3).to_string(index=False))
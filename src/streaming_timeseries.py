@@ -0,0 +1,176 @@
+# --- Pandas Handbook: Streaming Time Series Operators ---
+# Incremental rolling means, lags, differences and period means that keep only O(window) state per series
+
+
+# --- Import Libraries ---
+# Import pandas and numpy for timestamps and missing values, collections for the rolling window
+import pandas as pd
+import numpy as np
+import math
+from collections import deque
+
+
+# --- Row Operators ---
+# Each operator takes one value per update and returns what pandas would return for that row
+class RollingMean:
+    """Like series.rolling(window).mean(): NaN until the window holds window non-missing values.
+
+    The sum is recomputed from the window on every update with math.fsum() instead of adding the
+    new value to and subtracting the oldest from a running total: a running total keeps the
+    rounding error of every value it has seen, so after one large outlier the means of an
+    unbounded stream would stay off for good. This costs O(window) per update.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.valid = 0
+
+    def update(self, value):
+        if len(self.values) == self.window and not np.isnan(self.values[0]):
+            self.valid -= 1
+        self.values.append(value)
+        if not np.isnan(value):
+            self.valid += 1
+        if self.valid < self.window:
+            return np.nan
+        return math.fsum(self.values) / self.window
+
+
+class Lag:
+    """Like series.shift(periods): the value from periods rows earlier."""
+
+    def __init__(self, periods=1):
+        self.values = deque([np.nan] * periods, maxlen=periods)
+
+    def update(self, value):
+        previous = self.values[0]
+        self.values.append(value)
+        return previous
+
+
+class Diff:
+    """Like series.diff(periods)."""
+
+    def __init__(self, periods=1):
+        self.lag = Lag(periods)
+
+    def update(self, value):
+        return value - self.lag.update(value)
+
+
+class PctChange:
+    """Like series.pct_change(periods) on data without missing values."""
+
+    def __init__(self, periods=1):
+        self.lag = Lag(periods)
+
+    def update(self, value):
+        previous = self.lag.update(value)
+        if previous == 0:
+            return np.inf if value > 0 else -np.inf if value < 0 else np.nan
+        return value / previous - 1
+
+
+class PeriodMean:
+    """Like series.resample('ME') or resample('YE').mean(), emitting each period once it is complete.
+
+    A period is complete when the first row of a later period arrives; periods without rows in
+    between are emitted as NaN, like resample() does. Call flush() at the end of the stream.
+    """
+
+    def __init__(self, freq='ME'):
+        if freq not in ('ME', 'YE'):
+            raise ValueError(f"freq must be 'ME' or 'YE', got {freq!r}")
+        self.freq = freq
+        self.current = None
+        self.total = 0.0
+        self.count = 0
+
+    def period_number(self, timestamp):
+        return timestamp.year * 12 + timestamp.month - 1 if self.freq == 'ME' else timestamp.year
+
+    def label(self, number):
+        # Periods are labelled with their last day, like resample('ME') and resample('YE')
+        if self.freq == 'ME':
+            return pd.Timestamp(year=number // 12, month=number % 12 + 1, day=1) + pd.offsets.MonthEnd(0)
+        return pd.Timestamp(year=number, month=12, day=31)
+
+    def update(self, timestamp, value):
+        number = self.period_number(timestamp)
+        closed = []
+        if self.current is not None and number != self.current:
+            closed = self.close_until(number)
+        if self.current is None:
+            self.current = number
+        if not np.isnan(value):
+            self.total += value
+            self.count += 1
+        return closed
+
+    def close_until(self, number):
+        closed = [(self.label(self.current), self.total / self.count if self.count else np.nan)]
+        closed += [(self.label(gap), np.nan) for gap in range(self.current + 1, number)]
+        self.current, self.total, self.count = number, 0.0, 0
+        return closed
+
+    def flush(self):
+        if self.current is None:
+            return []
+        closed = [(self.label(self.current), self.total / self.count if self.count else np.nan)]
+        self.current, self.total, self.count = None, 0.0, 0
+        return closed
+
+
+# --- Series State ---
+class SeriesStream:
+    """The operators of 09_dates_timeseries.py for one value column of one series.
+
+    update() returns the rolling mean, previous value, difference and percentage change of the
+    new row, plus the monthly and yearly means of every period completed by it.
+    """
+
+    def __init__(self, column, window=3, periods=1, freqs=('ME', 'YE')):
+        self.column = column
+        self.last_timestamp = None
+        self.rolling = RollingMean(window)
+        self.lag = Lag(periods)
+        self.diff = Diff(periods)
+        self.pct_change = PctChange(periods)
+        self.period_means = {freq: PeriodMean(freq) for freq in freqs}
+
+    def update(self, timestamp, row):
+        timestamp = pd.Timestamp(timestamp)
+        if self.last_timestamp is not None and timestamp < self.last_timestamp:
+            raise ValueError(f"Rows must arrive in timestamp order, got {timestamp} after {self.last_timestamp}")
+        self.last_timestamp = timestamp
+
+        value = float(row[self.column])
+        return {
+            'rolling_mean': self.rolling.update(value),
+            'prev': self.lag.update(value),
+            'diff': self.diff.update(value),
+            'pct_change': self.pct_change.update(value),
+            'closed_periods': {freq: mean.update(timestamp, value) for freq, mean in self.period_means.items()},
+        }
+
+    def flush(self):
+        """Close the periods still open at the end of the stream."""
+        return {freq: mean.flush() for freq, mean in self.period_means.items()}
+
+
+class KeyedStream:
+    """Keep one SeriesStream per key, for example per weather station."""
+
+    def __init__(self, column, **stream_kwargs):
+        self.column = column
+        self.stream_kwargs = stream_kwargs
+        self.streams = {}
+
+    def update(self, key, timestamp, row):
+        if key not in self.streams:
+            self.streams[key] = SeriesStream(self.column, **self.stream_kwargs)
+        return self.streams[key].update(timestamp, row)
+
+    def flush(self):
+        return {key: stream.flush() for key, stream in self.streams.items()}
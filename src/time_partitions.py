@@ -0,0 +1,115 @@
+# --- Pandas Handbook: Time-Partitioned Store ---
+# Stores time series as one Parquet file per year and month with a min/max index, so date slices open only overlapping files
+
+
+# --- Import Libraries ---
+# Import pandas and numpy for data handling and json/pathlib for the partition index
+import pandas as pd
+import numpy as np
+import json
+import shutil
+from pathlib import Path
+
+
+# --- Writing Partitions ---
+def partition_file(year, month):
+    return f"year={year}/month={month:02d}/part.parquet"
+
+
+def write_time_partitions(df, path, time_column='date', mode='replace'):
+    """Write a date-indexed (or time_column) DataFrame into year/month partitions under path.
+
+    Rows are sorted by time inside each partition. mode='replace' rewrites the store, with
+    mode='append' rows of a month that already has a partition are merged into it, so new data
+    can be added day by day. index.json records the rows and the first and last timestamp of
+    every partition.
+    """
+    if mode not in ('replace', 'append'):
+        raise ValueError(f"mode must be 'replace' or 'append', got {mode!r}")
+    path = Path(path)
+    if mode == 'replace' and (path / "index.json").exists():
+        shutil.rmtree(path)
+    frame = df.reset_index() if df.index.name == time_column else df
+    times = pd.DatetimeIndex(frame[time_column])
+    index = read_partition_index(path)
+
+    for (year, month), part in frame.groupby([times.year, times.month], sort=True):
+        file = partition_file(year, month)
+        if file in index:
+            part = pd.concat([pd.read_parquet(path / file), part], ignore_index=True)
+        part = part.sort_values(time_column, kind='stable', ignore_index=True)
+
+        (path / file).parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = path / f"{file}.tmp"
+        part.to_parquet(tmp_file, index=False)
+        tmp_file.replace(path / file)
+        index[file] = {'rows': len(part), 'min': part[time_column].iloc[0].isoformat(),
+                       'max': part[time_column].iloc[-1].isoformat()}
+
+    meta = {'time_column': time_column, 'partitions': dict(sorted(index.items()))}
+    (path / "index.json").write_text(json.dumps(meta, indent=2))
+
+
+def read_partition_index(path):
+    """Return {file: {'rows', 'min', 'max'}} of a store, empty if it does not exist yet."""
+    index_file = Path(path) / "index.json"
+    return json.loads(index_file.read_text())['partitions'] if index_file.exists() else {}
+
+
+# --- Reading Time Ranges ---
+def time_bounds(start=None, end=None):
+    """Turn loc-style bounds into timestamps: '2013' starts on 2013-01-01 and, as an end, runs to the end of 2013."""
+    def bound(value, side):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            period = pd.Period(value)
+            return period.start_time if side == 'start' else period.end_time
+        return pd.Timestamp(value)
+
+    return bound(start, 'start'), bound(end, 'end')
+
+
+class TimePartitionStore:
+    """Date-range reads from a store written by write_time_partitions()."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        meta = json.loads((self.path / "index.json").read_text())
+        self.time_column = meta['time_column']
+        self.partitions = {file: (pd.Timestamp(entry['min']), pd.Timestamp(entry['max']))
+                           for file, entry in meta['partitions'].items()}
+
+    def overlapping(self, start=None, end=None):
+        """Return the partition files whose min/max range overlaps [start, end]."""
+        return [file for file, (low, high) in self.partitions.items()
+                if (start is None or high >= start) and (end is None or low <= end)]
+
+    def select(self, start=None, end=None, columns=None, inclusive='both'):
+        """Return the rows between start and end with the time column as a sorted index.
+
+        Like date_df.loc[start:end]: string bounds are partial dates, so
+        select('2013-01-02', '2013-01-09') includes the whole of January 9th.
+        inclusive='left' gives the half-open range start <= time < end of a boolean filter.
+        """
+        start, end = time_bounds(start, end)
+        files = self.overlapping(start, end)
+        read_columns = None if columns is None else [self.time_column] + [name for name in columns if name != self.time_column]
+
+        parts = [pd.read_parquet(self.path / file, columns=read_columns) for file in files]
+        if not parts:
+            empty = pd.read_parquet(self.path / next(iter(self.partitions)), columns=read_columns).iloc[:0]
+            return empty.set_index(self.time_column)
+        frame = pd.concat(parts, ignore_index=True).set_index(self.time_column)
+
+        # Only the first and last partition can hold rows outside the range
+        keep = np.ones(len(frame), dtype=bool)
+        if start is not None:
+            keep &= frame.index >= start
+        if end is not None:
+            keep &= (frame.index <= end) if inclusive == 'both' else (frame.index < end)
+        return frame[keep]
+
+    def loc(self, key, columns=None):
+        """Like date_df.loc['2013'] or date_df.loc['2013-01']: all rows of a partial date."""
+        return self.select(key, key, columns=columns)
@@ -0,0 +1,40 @@
+# --- Pandas Handbook: Zero-Copy Feather Loading ---
+# Memory-maps uncompressed Arrow IPC (Feather v2) files so columns point into the page cache instead of private copies
+
+
+# --- Import Libraries ---
+# Import pandas for data handling, pyarrow for memory mapping and warnings to flag copying reads
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import warnings
+
+
+# --- Writing ---
+def write_feather_uncompressed(df, path):
+    """Write a Feather file without compression, only uncompressed buffers can be memory-mapped."""
+    feather.write_feather(df, path, compression='uncompressed')
+
+
+# --- Loading ---
+def read_feather_mmap(path, columns=None):
+    """Load a Feather file as a DataFrame whose columns are views of the memory-mapped file.
+
+    Columns and index get Arrow-backed pandas dtypes (pd.ArrowDtype), so no data is copied into
+    NumPy blocks. Every process that maps the same file shares
+    one copy of it in the operating system page cache. Compressed files must be decompressed
+    into memory, so they still load but a warning points to write_feather_uncompressed().
+    """
+    allocated_before = pa.total_allocated_bytes()
+    with pa.memory_map(str(path), 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        metadata = table.schema.pandas_metadata or {'index_columns': []}
+        index_columns = [name for name in metadata['index_columns'] if isinstance(name, str)]
+        table = table.select(list(columns) + [name for name in index_columns if name not in columns])
+
+    if pa.total_allocated_bytes() - allocated_before > 0:
+        warnings.warn(f"{path} is compressed and was copied into memory, "
+                      f"rewrite it with write_feather_uncompressed() for zero-copy loading")
+
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
@@ -0,0 +1,44 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from out_of_core_join import merge_out_of_core
+
+
+def sorted_frame(df):
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+@pytest.mark.parametrize('how', ['inner', 'left', 'right', 'outer'])
+def test_int_and_float_keys(tmp_path, how):
+    rng = np.random.default_rng(0)
+    left = pd.DataFrame({'key': rng.integers(0, 50, 300), 'a': np.arange(300)})
+    right = pd.DataFrame({'key': rng.integers(0, 50, 200).astype('float64'), 'b': np.arange(200)})
+    # -0.0 equals 0.0 in pd.merge() and must land in the same partition
+    right.loc[right['key'] == 0, 'key'] = -0.0
+
+    path = tmp_path / "merged.parquet"
+    rows = merge_out_of_core(left, right, path, on='key', how=how, partitions=8, chunksize=64)
+
+    expected = pd.merge(left, right, on='key', how=how)
+    assert rows == len(expected)
+    pd.testing.assert_frame_equal(sorted_frame(pd.read_parquet(path)), sorted_frame(expected), check_dtype=False)
+
+
+def test_csv_chunks_with_int_and_float_keys(tmp_path):
+    # The second chunk of the left CSV has a missing key and is read as float64, the first as int64
+    left_csv = tmp_path / "left.csv"
+    left_csv.write_text("key,a\n1,10\n2,20\n3,30\n,40\n2,50\n3,60\n")
+    right = pd.DataFrame({'key': [1, 2, 3, 2], 'b': [100, 200, 300, 400]})
+
+    path = tmp_path / "merged.parquet"
+    rows = merge_out_of_core(left_csv, right, path, on='key', partitions=4, chunksize=3)
+
+    expected = pd.merge(pd.read_csv(left_csv), right, on='key')
+    assert rows == len(expected) == 7
+    pd.testing.assert_frame_equal(sorted_frame(pd.read_parquet(path)), sorted_frame(expected), check_dtype=False)